@@ -1,4 +1,4 @@
-import sqlite3
+import sqlite_profile
 
 class ExecuteQuery:
     def __init__(self, db_name, query, params=None):
@@ -9,7 +9,7 @@ class ExecuteQuery:
         self.result = None
 
     def __enter__(self):
-        self.conn = sqlite3.connect(self.db_name)
+        self.conn = sqlite_profile.connect(self.db_name)
         cursor = self.conn.cursor()
         cursor.execute(self.query, self.params)
         self.result = cursor.fetchall()
@@ -1,14 +1,17 @@
 import aiosqlite
 import asyncio
+import sqlite_profile
 
 async def async_fetch_users():
     async with aiosqlite.connect("app.db") as conn:
+        await sqlite_profile.apply_profile_async(conn)
         async with conn.execute("SELECT * FROM users") as cursor:
             results = await cursor.fetchall()
             return results
 
 async def async_fetch_older_users():
     async with aiosqlite.connect("app.db") as conn:
+        await sqlite_profile.apply_profile_async(conn)
         async with conn.execute("SELECT * FROM users WHERE age > 40") as cursor:
             results = await cursor.fetchall()
             return results
@@ -0,0 +1,48 @@
+# Deliberate copy of python-decorators-0x01/sqlite_profile.py, which is the
+# source (see it for why each PRAGMA is set): these task directories run as
+# standalone scripts and cannot import each other. Keep the two in sync;
+# only apply_profile_async at the bottom is specific to this directory.
+import os
+import sqlite3
+
+PERFORMANCE_PROFILE = {
+    "busy_timeout": int(os.environ.get("APP_DB_BUSY_TIMEOUT_MS", 5000)),
+    "journal_mode": "WAL",
+    "synchronous": "NORMAL",
+    "cache_size": -64 * 1024,         # negative means KiB: 64 MiB page cache
+    "mmap_size": 256 * 1024 * 1024,   # bytes of the file read through mmap
+    "temp_store": "MEMORY",
+}
+
+
+def profile_statements(overrides=None):
+    """PRAGMA statements for the performance profile with overrides applied."""
+    profile = dict(PERFORMANCE_PROFILE, **(overrides or {}))
+    return [
+        f"PRAGMA {name} = {value}"
+        for name, value in profile.items()
+        if value is not None
+    ]
+
+
+def apply_profile(conn, overrides=None):
+    """
+    Applies the performance profile to an open connection. Pass overrides
+    to change values, or None as a value to leave that PRAGMA alone.
+    """
+    for statement in profile_statements(overrides):
+        conn.execute(statement).fetchall()
+    return conn
+
+
+def connect(path, overrides=None, **connect_kwargs):
+    """sqlite3.connect with the performance profile applied."""
+    return apply_profile(sqlite3.connect(path, **connect_kwargs), overrides)
+
+
+async def apply_profile_async(conn, overrides=None):
+    """apply_profile for an aiosqlite connection."""
+    for statement in profile_statements(overrides):
+        async with conn.execute(statement) as cursor:
+            await cursor.fetchall()
+    return conn
@@ -1,26 +1,134 @@
 import functools
+import itertools
 import logging
-import sqlite3
-from datetime import datetime
+import time
+import db_pool
+
+logger = logging.getLogger("queries")
+
+REDACTED = "***"
+
+
+def _find_query(args, kwargs):
+    """The SQL text and params a decorated function was called with."""
+    query = kwargs.get("query")
+    params = kwargs.get("params")
+    # positional (query, params) only when the first argument is the SQL,
+    # not for e.g. get_user(conn, user_id)
+    if query is None and args and isinstance(args[0], str):
+        query = args[0]
+        if params is None and len(args) > 1:
+            params = args[1]
+    return query, params
+
+
+def _redact(params, redact):
+    """
+    Masks sensitive parameters: redact=True hides them all, otherwise it
+    holds the positions (sequence params) or names (dict params) to mask.
+    """
+    if params is None or not redact:
+        return params
+    if redact is True:
+        return REDACTED
+    if isinstance(params, dict):
+        return {k: REDACTED if k in redact else v for k, v in params.items()}
+    if isinstance(params, (list, tuple)):
+        return tuple(REDACTED if i in redact else v for i, v in enumerate(params))
+    # a single bare value: there is no position to pick, so hide it
+    return REDACTED
+
+
+def _rowcount(result):
+    try:
+        return len(result)
+    except TypeError:
+        return getattr(result, "rowcount", None)
+
+
+def _emit(func, args, kwargs, result, error, seconds, sampled, slow_threshold, level, redact):
+    """Logs one call, if it was sampled, slow or failed and its level is enabled."""
+    slow = slow_threshold is not None and seconds >= slow_threshold
+    if slow:
+        emit_level = logging.WARNING
+    elif error is not None:
+        emit_level = logging.ERROR
+    else:
+        emit_level = level
+    if not (sampled or slow or error is not None) or not logger.isEnabledFor(emit_level):
+        return
+    query, params = _find_query(args, kwargs)
+    rowcount = None if error is not None else _rowcount(result)
+    params = _redact(params, redact)
+    logger.log(
+        emit_level,
+        "%s %.2fms rows=%s params=%s%s%s%s: %s",
+        func.__name__, seconds * 1000, rowcount, params,
+        " slow" if slow else "", " failed: " if error is not None else "",
+        error if error is not None else "", query,
+        extra={
+            "query": query, "params": params,
+            "duration_ms": seconds * 1000, "rowcount": rowcount,
+            "slow": slow, "function": func.__qualname__,
+        },
+    )
+
+
+def log_queries(func=None, *, level=logging.INFO, sample=1, slow_threshold=None, redact=()):
+    """
+    Logs the SQL a function runs, with its duration in ms, the rows it
+    returned and its params, to the "queries" logger. Only 1 in sample
+    calls is logged; calls slower than slow_threshold seconds are always
+    logged, at WARNING, and logged calls that raise go out at ERROR.
+    Nothing is timed or formatted when no record could be emitted, and a
+    failure while logging never reaches the caller.
+    Use as @log_queries or @log_queries(sample=100, ...).
+    """
+    if func is None:
+        return functools.partial(
+            log_queries, level=level, sample=sample,
+            slow_threshold=slow_threshold, redact=redact,
+        )
+    calls = itertools.count()
 
-def log_queries(func):
     @functools.wraps(func)
     def wrapper_log_queries(*args, **kwargs):
-        if 'query' in kwargs:
-            logging.info(f"{datetime.now()} SQL Query: {kwargs['query']}")
-        return func(*args, **kwargs)
+        sampled = next(calls) % sample == 0 and logger.isEnabledFor(level)
+        if not sampled and slow_threshold is None:
+            return func(*args, **kwargs)
+
+        start = time.perf_counter()
+        result = error = None
+        finished = False
+        try:
+            result = func(*args, **kwargs)
+            finished = True
+            return result
+        except Exception as e:
+            error = e
+            raise
+        finally:
+            # KeyboardInterrupt and friends propagate unlogged
+            if finished or error is not None:
+                try:
+                    _emit(func, args, kwargs, result, error,
+                          time.perf_counter() - start, sampled, slow_threshold, level, redact)
+                except Exception:
+                    pass
     return wrapper_log_queries
 
 @log_queries
 def fetch_all_users(query):
-    conn = sqlite3.connect('app.db')
+    conn = db_pool.connect()
     cursor = conn.cursor()
     cursor.execute(query)
     results = cursor.fetchall()
     conn.close()
     return results
 
-#fetch users while logging the query
-users = fetch_all_users(query="SELECT * FROM users")
-print(users)
-    
\ No newline at end of file
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s %(message)s")
+
+    #fetch users while logging the query
+    users = fetch_all_users(query="SELECT * FROM users")
+    print(users)
@@ -1,5 +1,6 @@
 import functools
-import sqlite3
+import db_pool
+import statements
 
 def with_db_connection(func):
     @functools.wraps(func)
@@ -7,7 +8,7 @@ def with_db_connection(func):
         conn = None
         try: 
             # connecting to the db
-            conn = sqlite3.connect("app.db")
+            conn = db_pool.connect()
             return func(conn, *args, **kwargs)
         finally:
             # save changes and close connection if it is open
@@ -16,11 +17,16 @@ def with_db_connection(func):
 
     return wrapper_with_db_connection
 
-@with_db_connection 
+# Pooled variant: reuses long-lived connections instead of opening one per call
+with_pooled_connection = db_pool.with_pooled_connection
+
+GET_USER_BY_ID = statements.declare(
+    "get_user_by_id", "SELECT * FROM users WHERE id = ?"
+)
+
+@with_pooled_connection
 def get_user_by_id(conn, user_id): 
-    cursor = conn.cursor() 
-    cursor.execute("SELECT * FROM users WHERE id = ?", (user_id,)) 
-    return cursor.fetchone() 
+    return GET_USER_BY_ID.fetchone(conn, (user_id,))
 
 
 # Fetch user by ID with automatic connection handling 
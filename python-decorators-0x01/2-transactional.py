@@ -1,12 +1,14 @@
 import functools
-import sqlite3
+import db_pool
+import result_cache
+import statements
 
 def with_db_connection(func):
     @functools.wraps(func)
     def wrapper_with_db_connection(*args, **kwargs):
         conn = None
         try: 
-            conn = sqlite3.connect("app.db")  
+            conn = db_pool.connect()  
             return func(conn, *args, **kwargs)
         finally:
             if conn:
@@ -17,21 +19,31 @@ def with_db_connection(func):
 def transactional(func):
     @functools.wraps(func)
     def wrapper_transactional(conn, *args, **kwargs):
+        # note which tables get written so cached reads of them can be dropped
+        result_cache.watch_writes(conn)
         try:
             result = func(conn, *args, **kwargs)
             conn.commit()
+            result_cache.writes_committed(conn)
             print(f"Transaction successful: {result}")
             return result
         except Exception as e:
             conn.rollback()
+            result_cache.writes_rolled_back(conn)
             print(f"Transaction rolled back: {e}")
     return wrapper_transactional
 
-@with_db_connection 
+# Pooled variant: reuses long-lived connections and their statement caches
+with_pooled_connection = db_pool.with_pooled_connection
+
+UPDATE_USER_EMAIL = statements.declare(
+    "update_user_email", "UPDATE users SET email = ? WHERE id = ?"
+)
+
+@with_pooled_connection 
 @transactional 
 def update_user_email(conn, user_id, new_email): 
-    cursor = conn.cursor() 
-    cursor.execute("UPDATE users SET email = ? WHERE id = ?", (new_email, user_id)) 
+    cursor = UPDATE_USER_EMAIL.run(conn, (new_email, user_id))
     if cursor.rowcount == 0:
         raise ValueError(f"No user found with ID {user_id}.")
     return f"Updated user {user_id} with email {new_email}"
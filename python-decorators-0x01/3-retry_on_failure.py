@@ -1,6 +1,7 @@
 import functools
 import time
 import sqlite3
+import db_pool
 
 
 def with_db_connection(func):
@@ -8,13 +9,15 @@ def with_db_connection(func):
     def wrapper_with_db_connection(*args, **kwargs):
         conn = None
         try: 
-            conn = sqlite3.connect("app.db")  
+            conn = db_pool.connect()  
             return func(conn, *args, **kwargs)
         finally:
             if conn:
                 conn.close()        
     return wrapper_with_db_connection
 
+# connections wait busy_timeout (sqlite_profile) for a lock before raising,
+# so "database is locked" only reaches this retry loop under heavy contention
 def retry_on_failure(retries, delay):
     def decorator(func):
         @functools.wraps(func)
@@ -1,15 +1,16 @@
 import functools
-import time
-import sqlite3
+import db_pool
+import result_cache
 
-query_cache = {} #in-memory cache
+# bounded LRU/TTL cache shared with the write-tracking in 2-transactional
+query_cache = result_cache.default_cache
 
 def with_db_connection(func):
     @functools.wraps(func)
     def wrapper_with_db_connection(*args, **kwargs):
         conn = None
         try: 
-            conn = sqlite3.connect("app.db")  
+            conn = db_pool.connect()  
             return func(conn, *args, **kwargs)
         finally:
             if conn:
@@ -22,14 +23,20 @@ def cache_query(func):
         query = kwargs.get("query") or (args[0] if args else None)
         if query is None:
             raise ValueError("Missing SQL query")
+        params = kwargs.get("params") or (args[1] if len(args) > 1 else ())
 
-        if query in query_cache:
+        key = query_cache.make_key(result_cache.database_id(conn), query, params)
+        if key is None:
+            # unhashable params, e.g. a list: run uncached
+            return func(conn, *args, **kwargs)
+        hit, result = query_cache.get(key)
+        if hit:
             print("Returning cached result for query")
-            return query_cache[query]
+            return result
 
         print("Querying DB and caching result")
         result = func(conn, *args, **kwargs)
-        query_cache[query] = result
+        query_cache.set(key, result)
         return result
 
     return wrapper_cache_query
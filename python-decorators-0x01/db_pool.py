@@ -0,0 +1,141 @@
+import functools
+import os
+import sqlite3
+import threading
+import time
+
+import result_cache
+import sqlite_profile
+
+# Database used by the decorators; override with the APP_DB environment variable
+DB_PATH = os.environ.get("APP_DB", "app.db")
+
+# Compiled statements each pooled connection keeps (sqlite3's default is 128)
+STATEMENT_CACHE_SIZE = 512
+
+
+class PoolTimeoutError(TimeoutError):
+    """Raised when no pooled connection frees up within the checkout timeout."""
+
+
+class SQLitePool:
+    """
+    Thread-safe pool of long-lived sqlite3 connections. Connections are
+    opened lazily up to size, get the performance profile (with pragmas as
+    overrides) applied once, and are rolled back to a clean state when
+    returned.
+    """
+
+    def __init__(self, path=None, size=5, timeout=5.0, pragmas=None, **connect_kwargs):
+        self.path = path or DB_PATH
+        self.size = size
+        self.timeout = timeout
+        self.pragmas = dict(pragmas or {})
+        self.connect_kwargs = dict(connect_kwargs)
+        self.connect_kwargs.setdefault("cached_statements", STATEMENT_CACHE_SIZE)
+        # idle connections, most recently returned last; both guarded by _lock
+        self._idle = []
+        self._opened = 0
+        self._lock = threading.Condition()
+
+    def _open(self):
+        conn = sqlite_profile.connect(
+            self.path, self.pragmas, check_same_thread=False, **self.connect_kwargs
+        )
+        # installed once so transactional does not expire cached statements
+        result_cache.track_writes(conn)
+        return conn
+
+    def _close(self, conn):
+        """Closes conn, which may already be closed, and frees its slot."""
+        try:
+            result_cache.untrack_writes(conn)
+            conn.close()
+        except sqlite3.Error:
+            pass
+        finally:
+            with self._lock:
+                self._opened -= 1
+                self._lock.notify()
+
+    def acquire(self, timeout=None):
+        """Checks out a connection, waiting up to timeout seconds for one."""
+        wait = self.timeout if timeout is None else timeout
+        deadline = time.monotonic() + wait
+        with self._lock:
+            while not self._idle and self._opened >= self.size:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    raise PoolTimeoutError(
+                        f"No connection to {self.path} free after {wait}s"
+                    )
+                self._lock.wait(remaining)
+            if self._idle:
+                return self._idle.pop()
+            # reserve the slot, then open outside the lock
+            self._opened += 1
+        try:
+            return self._open()
+        except Exception:
+            with self._lock:
+                self._opened -= 1
+                self._lock.notify()
+            raise
+
+    def release(self, conn):
+        """Returns a connection, discarding any uncommitted work."""
+        try:
+            if conn.in_transaction:
+                conn.rollback()
+        except sqlite3.Error:
+            self._close(conn)
+            return
+        with self._lock:
+            self._idle.append(conn)
+            self._lock.notify()
+
+    def close_all(self):
+        """Closes every idle connection."""
+        with self._lock:
+            idle, self._idle = self._idle, []
+        for conn in idle:
+            self._close(conn)
+
+
+def connect(path=None, **connect_kwargs):
+    """Opens a standalone connection to path (DB_PATH by default), tuned."""
+    return sqlite_profile.connect(path or DB_PATH, **connect_kwargs)
+
+
+_pools = {}
+_pools_lock = threading.Lock()
+
+
+def get_pool(path=None, **settings):
+    """Returns the shared pool for path, creating it with settings on first use."""
+    path = path or DB_PATH
+    with _pools_lock:
+        if path not in _pools:
+            _pools[path] = SQLitePool(path, **settings)
+        return _pools[path]
+
+
+def with_pooled_connection(func=None, *, path=None):
+    """
+    Pooled variant of with_db_connection: borrows a connection from the
+    shared pool for path (DB_PATH by default) instead of opening one.
+    Use as @with_pooled_connection or @with_pooled_connection(path="x.db").
+    """
+    if func is None:
+        return functools.partial(with_pooled_connection, path=path)
+
+    @functools.wraps(func)
+    def wrapper_with_pooled_connection(*args, **kwargs):
+        pool = get_pool(path)
+        conn = pool.acquire()
+        try:
+            return func(conn, *args, **kwargs)
+        finally:
+            pool.release(conn)
+
+    return wrapper_with_pooled_connection
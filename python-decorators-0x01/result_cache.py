@@ -0,0 +1,222 @@
+import re
+import sys
+import threading
+import time
+from collections import OrderedDict
+
+# Tables a SELECT reads from, for table-level invalidation: every entry of
+# a FROM list (comma joins, with or without aliases) and every JOIN target
+_TABLE_NAME = r"[\"`\[]?(?:\w+)[\"`\]]?"
+TABLE_PATTERN = re.compile(
+    rf"\b(?:FROM|JOIN)\s+((?:{_TABLE_NAME}(?:\s+(?:AS\s+)?\w+)?\s*,\s*)*{_TABLE_NAME})",
+    re.IGNORECASE,
+)
+
+# Table a statement writes to, matched on the text SQLite traces as it runs
+WRITE_PATTERN = re.compile(
+    r"^\s*(?:INSERT(?:\s+OR\s+\w+)?\s+INTO|REPLACE\s+INTO|UPDATE(?:\s+OR\s+\w+)?"
+    r"|DELETE\s+FROM|DROP\s+TABLE(?:\s+IF\s+EXISTS)?)\s+[\"`\[]?(\w+)",
+    re.IGNORECASE,
+)
+
+
+def tables_read(query):
+    """Lower-cased names of the tables a query reads."""
+    return frozenset(
+        re.match(r"[\"`\[]?(\w+)", table.strip()).group(1).lower()
+        for tables in TABLE_PATTERN.findall(query)
+        for table in tables.split(",")
+    )
+
+
+def database_id(conn):
+    """Identifies the database file behind a connection."""
+    for _, name, path in conn.execute("PRAGMA database_list"):
+        if name == "main":
+            return path or f":memory:{id(conn)}"
+    return f"unknown:{id(conn)}"
+
+
+def _result_size(result):
+    """Rough size in bytes of a fetched result."""
+    size = sys.getsizeof(result)
+    if isinstance(result, (list, tuple)):
+        for row in result:
+            size += sys.getsizeof(row)
+            if isinstance(row, (list, tuple)):
+                size += sum(sys.getsizeof(value) for value in row)
+    return size
+
+
+class QueryCache:
+    """
+    Thread-safe LRU cache of query results bounded by entry count and total
+    bytes, with a per-entry TTL and table-level invalidation.
+    """
+
+    def __init__(self, max_entries=256, max_bytes=16 * 1024 * 1024, ttl=300):
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.ttl = ttl
+        self._entries = OrderedDict()
+        self._bytes = 0
+        self._lock = threading.Lock()
+        self.stats = {
+            "hits": 0, "misses": 0, "evictions": 0,
+            "expirations": 0, "invalidations": 0,
+        }
+
+    @staticmethod
+    def make_key(db, query, params=()):
+        """
+        Cache key for a query, on its text exactly as given; dict (named)
+        params are keyed by their items. Returns None, meaning do not cache,
+        when params are unhashable.
+        """
+        if isinstance(params, dict):
+            params = tuple(sorted(params.items()))
+        key = (db, query, tuple(params or ()))
+        try:
+            hash(key)
+        except TypeError:
+            return None
+        return key
+
+    def get(self, key):
+        """Returns (True, result) on a fresh hit, else (False, None)."""
+        if key is None:
+            return False, None
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self.stats["misses"] += 1
+                return False, None
+            result, size, expires, _ = entry
+            if expires < time.monotonic():
+                self._remove(key)
+                self.stats["expirations"] += 1
+                self.stats["misses"] += 1
+                return False, None
+            self._entries.move_to_end(key)
+            self.stats["hits"] += 1
+            return True, result
+
+    def set(self, key, result, ttl=None):
+        """Stores a result, evicting least recently used entries to fit."""
+        size = _result_size(result)
+        if key is None or size > self.max_bytes:
+            return
+        expires = time.monotonic() + (self.ttl if ttl is None else ttl)
+        with self._lock:
+            if key in self._entries:
+                self._remove(key)
+            self._entries[key] = (result, size, expires, tables_read(key[1]))
+            self._bytes += size
+            while len(self._entries) > self.max_entries or self._bytes > self.max_bytes:
+                oldest = next(iter(self._entries))
+                self._remove(oldest)
+                self.stats["evictions"] += 1
+
+    def invalidate(self, db, tables):
+        """Drops every cached result for db that read any of tables."""
+        tables = {table.lower() for table in tables}
+        with self._lock:
+            stale = [
+                key for key, entry in self._entries.items()
+                if key[0] == db and entry[3] & tables
+            ]
+            for key in stale:
+                self._remove(key)
+            self.stats["invalidations"] += len(stale)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self._bytes = 0
+
+    def _remove(self, key):
+        _, size, _, _ = self._entries.pop(key)
+        self._bytes -= size
+
+    def info(self):
+        """Hit/miss/eviction counters plus current size."""
+        with self._lock:
+            return dict(self.stats, entries=len(self._entries), bytes=self._bytes)
+
+
+default_cache = QueryCache()
+
+class _WriteTracker:
+    """
+    Trace callback noting the tables written while written is a set.
+    A trace callback, unlike an authorizer, does not expire the
+    connection's prepared statements when installed, and it sees cached
+    statements too since it fires on every run rather than on prepare.
+    Writes made by triggers are not seen.
+    """
+
+    def __init__(self, conn, temporary):
+        self.conn = conn
+        self.temporary = temporary
+        self.written = None
+
+    def __call__(self, statement):
+        if self.written is not None:
+            match = WRITE_PATTERN.match(statement)
+            if match:
+                self.written.add(match.group(1).lower())
+
+
+# id(conn) -> its _WriteTracker; the tracker holds conn, so ids stay unique
+_trackers = {}
+
+
+def _tracker(conn):
+    tracker = _trackers.get(id(conn))
+    return tracker if tracker is not None and tracker.conn is conn else None
+
+
+def track_writes(conn, temporary=False):
+    """
+    Installs write tracking on conn once; db_pool does this for every
+    pooled connection. Nothing is recorded until watch_writes(conn).
+    """
+    tracker = _WriteTracker(conn, temporary)
+    _trackers[id(conn)] = tracker
+    conn.set_trace_callback(tracker)
+    return tracker
+
+
+def untrack_writes(conn):
+    """Removes write tracking, e.g. before closing a pooled connection."""
+    if _tracker(conn) is not None:
+        del _trackers[id(conn)]
+        conn.set_trace_callback(None)
+
+
+def watch_writes(conn):
+    """Records every table written through conn until it commits or rolls back."""
+    tracker = _tracker(conn) or track_writes(conn, temporary=True)
+    tracker.written = set()
+
+
+def _stop_watching(conn):
+    tracker = _tracker(conn)
+    if tracker is None:
+        return set()
+    written, tracker.written = tracker.written, None
+    if tracker.temporary:
+        untrack_writes(conn)
+    return written or set()
+
+
+def writes_committed(conn, cache=None):
+    """Invalidates cached results for the tables written on conn."""
+    written = _stop_watching(conn)
+    if written:
+        (cache or default_cache).invalidate(database_id(conn), written)
+
+
+def writes_rolled_back(conn):
+    """Forgets pending writes; nothing reached the database."""
+    _stop_watching(conn)
@@ -0,0 +1,41 @@
+import os
+import sqlite3
+
+# PRAGMAs applied to every connection the decorators open. WAL lets readers
+# run alongside a writer, busy_timeout makes SQLite wait for a lock instead
+# of failing straight away, and synchronous=NORMAL is durable under WAL
+# except for the last transactions before a power loss.
+# busy_timeout goes first so switching journal mode can wait for its lock.
+PERFORMANCE_PROFILE = {
+    "busy_timeout": int(os.environ.get("APP_DB_BUSY_TIMEOUT_MS", 5000)),
+    "journal_mode": "WAL",
+    "synchronous": "NORMAL",
+    "cache_size": -64 * 1024,         # negative means KiB: 64 MiB page cache
+    "mmap_size": 256 * 1024 * 1024,   # bytes of the file read through mmap
+    "temp_store": "MEMORY",
+}
+
+
+def profile_statements(overrides=None):
+    """PRAGMA statements for the performance profile with overrides applied."""
+    profile = dict(PERFORMANCE_PROFILE, **(overrides or {}))
+    return [
+        f"PRAGMA {name} = {value}"
+        for name, value in profile.items()
+        if value is not None
+    ]
+
+
+def apply_profile(conn, overrides=None):
+    """
+    Applies the performance profile to an open connection. Pass overrides
+    to change values, or None as a value to leave that PRAGMA alone.
+    """
+    for statement in profile_statements(overrides):
+        conn.execute(statement).fetchall()
+    return conn
+
+
+def connect(path, overrides=None, **connect_kwargs):
+    """sqlite3.connect with the performance profile applied."""
+    return apply_profile(sqlite3.connect(path, **connect_kwargs), overrides)
@@ -0,0 +1,136 @@
+import re
+import threading
+import time
+
+# A quoted literal or identifier (kept as is), or a run of whitespace
+_TOKEN = re.compile(r"('(?:[^']|'')*'|\"(?:[^\"]|\"\")*\")|\s+")
+
+
+def _normalise(sql):
+    """sql with whitespace outside quotes collapsed, for comparing declarations."""
+    return _TOKEN.sub(lambda m: m.group(1) or " ", sql).strip()
+
+
+class Statement:
+    """
+    A named, parameterised SQL statement declared once at import time.
+    Every execution goes through the same SQL string, so the sqlite3
+    statement cache on a pooled connection (db_pool.STATEMENT_CACHE_SIZE
+    entries) hands back the already-compiled statement instead of parsing
+    and planning it again. Calls, time and rows are recorded per statement.
+    """
+
+    def __init__(self, name, sql):
+        self.name = name
+        self.sql = sql
+        self._lock = threading.Lock()
+        self.reset()
+
+    def reset(self):
+        with self._lock:
+            self.calls = 0
+            self.errors = 0
+            self.seconds = 0.0
+            self.max_seconds = 0.0
+            self.rows = 0
+
+    def _record(self, start, rows, failed=False):
+        seconds = time.perf_counter() - start
+        with self._lock:
+            self.calls += 1
+            self.errors += failed
+            self.seconds += seconds
+            self.max_seconds = max(self.max_seconds, seconds)
+            self.rows += rows
+
+    def run(self, conn, params=()):
+        """Executes the statement and returns the cursor (for rowcount etc.)."""
+        start = time.perf_counter()
+        try:
+            cursor = conn.execute(self.sql, params)
+        except Exception:
+            self._record(start, 0, failed=True)
+            raise
+        self._record(start, max(cursor.rowcount, 0))
+        return cursor
+
+    def fetchone(self, conn, params=()):
+        start = time.perf_counter()
+        try:
+            row = conn.execute(self.sql, params).fetchone()
+        except Exception:
+            self._record(start, 0, failed=True)
+            raise
+        self._record(start, row is not None)
+        return row
+
+    def fetchall(self, conn, params=()):
+        start = time.perf_counter()
+        try:
+            rows = conn.execute(self.sql, params).fetchall()
+        except Exception:
+            self._record(start, 0, failed=True)
+            raise
+        self._record(start, len(rows))
+        return rows
+
+    def info(self):
+        with self._lock:
+            return {
+                "name": self.name, "sql": self.sql, "calls": self.calls,
+                "errors": self.errors, "seconds": self.seconds,
+                "avg_seconds": self.seconds / self.calls if self.calls else 0.0,
+                "max_seconds": self.max_seconds, "rows": self.rows,
+            }
+
+
+class StatementRegistry:
+    """Named statements for the decorated DB functions, with their stats."""
+
+    def __init__(self):
+        self._statements = {}
+        self._lock = threading.Lock()
+
+    def declare(self, name, sql):
+        """
+        Registers sql under name, unchanged, and returns its Statement.
+        Declaring the same name again returns the existing one, even with
+        other layout; different SQL is an error.
+        """
+        with self._lock:
+            existing = self._statements.get(name)
+            if existing is not None:
+                if _normalise(existing.sql) != _normalise(sql):
+                    raise ValueError(f"Statement {name!r} already declared with different SQL")
+                return existing
+            statement = self._statements[name] = Statement(name, sql)
+            return statement
+
+    def __getitem__(self, name):
+        return self._statements[name]
+
+    def stats(self):
+        """Per-statement counters, busiest (by total time) first."""
+        with self._lock:
+            statements = list(self._statements.values())
+        return sorted(
+            (statement.info() for statement in statements),
+            key=lambda info: info["seconds"], reverse=True,
+        )
+
+    def reset(self):
+        with self._lock:
+            statements = list(self._statements.values())
+        for statement in statements:
+            statement.reset()
+
+    def report(self):
+        """Prints one line of counters per statement."""
+        for info in self.stats():
+            print(f"{info['name']}: {info['calls']} calls, {info['errors']} errors, "
+                  f"{info['seconds'] * 1000:.2f}ms total, "
+                  f"{info['avg_seconds'] * 1000:.3f}ms avg, {info['rows']} rows")
+
+
+registry = StatementRegistry()
+declare = registry.declare
@@ -0,0 +1,115 @@
+#!/usr/bin/env python3
+"""Unit tests for db_pool"""
+import os
+import sqlite3
+import tempfile
+import threading
+import unittest
+
+import db_pool
+
+
+class TestSQLitePool(unittest.TestCase):
+    """
+    Test case for SQLitePool checkout, release and settings.
+    """
+
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.tmp.name, "app.db")
+        conn = sqlite3.connect(self.path)
+        conn.execute("CREATE TABLE users (id INTEGER PRIMARY KEY, email TEXT)")
+        conn.commit()
+        conn.close()
+        self.pool = db_pool.SQLitePool(self.path, size=2, timeout=0.05)
+
+    def tearDown(self):
+        self.pool.close_all()
+        self.tmp.cleanup()
+
+    def test_reuses_connections(self):
+        """A released connection is handed out again rather than reopened."""
+        conn = self.pool.acquire()
+        self.pool.release(conn)
+        self.assertIs(self.pool.acquire(), conn)
+
+    def test_timeout(self):
+        """Checkout past size waits, then raises PoolTimeoutError."""
+        self.pool.acquire()
+        self.pool.acquire()
+        with self.assertRaises(db_pool.PoolTimeoutError) as context:
+            self.pool.acquire(timeout=0.01)
+        self.assertIn("0.01s", str(context.exception))
+
+    def test_waiter_woken_when_connection_dropped(self):
+        """A thread waiting on a full pool gets a slot freed by a dropped connection."""
+        pool = db_pool.SQLitePool(self.path, size=1, timeout=5)
+        conn = pool.acquire()
+        got = []
+        waiter = threading.Thread(target=lambda: got.append(pool.acquire()))
+        waiter.start()
+        conn.close()
+        # rolling back a closed connection fails, so release drops it
+        pool.release(conn)
+        waiter.join(2)
+        self.assertFalse(waiter.is_alive())
+        self.assertIsNot(got[0], conn)
+        pool.release(got[0])
+        pool.close_all()
+
+    def test_close_all_frees_slots(self):
+        """Closing idle connections lets new ones be opened."""
+        pool = db_pool.SQLitePool(self.path, size=1, timeout=0.05)
+        conn = pool.acquire()
+        pool.release(conn)
+        conn.close()
+        pool.close_all()
+        fresh = pool.acquire()
+        self.assertIsNot(fresh, conn)
+        pool.release(fresh)
+        pool.close_all()
+
+    def test_release_rolls_back(self):
+        """Uncommitted work is discarded when a connection is returned."""
+        conn = self.pool.acquire()
+        conn.execute("INSERT INTO users (email) VALUES ('a')")
+        self.pool.release(conn)
+        self.assertFalse(conn.in_transaction)
+        count = self.pool.acquire().execute("SELECT COUNT(*) FROM users").fetchone()
+        self.assertEqual(count, (0,))
+
+    def test_profile_and_statement_cache(self):
+        """Pooled connections get the tuned PRAGMAs, with overrides applied."""
+        pool = db_pool.SQLitePool(self.path, pragmas={"cache_size": -1024})
+        conn = pool.acquire()
+        self.assertEqual(conn.execute("PRAGMA journal_mode").fetchone(), ("wal",))
+        self.assertEqual(conn.execute("PRAGMA cache_size").fetchone(), (-1024,))
+        self.assertEqual(
+            pool.connect_kwargs["cached_statements"], db_pool.STATEMENT_CACHE_SIZE
+        )
+        pool.release(conn)
+        pool.close_all()
+
+    def test_threads_share_bounded_connections(self):
+        """Many threads are served by at most size connections."""
+        seen = set()
+        lock = threading.Lock()
+
+        @db_pool.with_pooled_connection(path=self.path)
+        def work(conn):
+            with lock:
+                seen.add(id(conn))
+            return conn.execute("SELECT COUNT(*) FROM users").fetchone()
+
+        db_pool.get_pool(self.path, size=2, timeout=5)
+        threads = [threading.Thread(target=work) for _ in range(10)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        self.assertLessEqual(len(seen), 2)
+        db_pool.get_pool(self.path).close_all()
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,148 @@
+#!/usr/bin/env python3
+"""Unit tests for log_queries"""
+import importlib
+import logging
+import unittest
+from unittest.mock import patch
+
+log_queries_module = importlib.import_module("0-log_queries")
+log_queries = log_queries_module.log_queries
+
+
+class TestLogQueries(unittest.TestCase):
+    """
+    Test case for the log_queries decorator.
+    """
+
+    def test_bare_and_configured(self):
+        """Both @log_queries and @log_queries(...) log query, rows and params."""
+        @log_queries
+        def bare(query, params=()):
+            return [(1,), (2,)]
+
+        @log_queries(level=logging.DEBUG)
+        def configured(query, params=()):
+            return []
+
+        with self.assertLogs("queries", logging.DEBUG) as logs:
+            bare("SELECT * FROM users WHERE id = ?", (5,))
+            configured(query="SELECT 1")
+        first, second = logs.records
+        self.assertEqual(first.query, "SELECT * FROM users WHERE id = ?")
+        self.assertEqual(first.rowcount, 2)
+        self.assertEqual(first.params, (5,))
+        self.assertEqual(second.levelno, logging.DEBUG)
+        self.assertRegex(
+            first.getMessage(),
+            r"^bare [\d.]+ms rows=2 params=\(5,\): SELECT \* FROM users WHERE id = \?$",
+        )
+
+    def test_sampling(self):
+        """Only one call in sample is logged."""
+        @log_queries(sample=3)
+        def fetch(query):
+            return []
+
+        with self.assertLogs("queries", logging.INFO) as logs:
+            for _ in range(9):
+                fetch("SELECT 1")
+        self.assertEqual(len(logs.records), 3)
+
+    def test_slow_always_logged(self):
+        """Calls over slow_threshold are logged at WARNING despite sampling."""
+        @log_queries(sample=1000, slow_threshold=0.0)
+        def fetch(query):
+            return []
+
+        with self.assertLogs("queries", logging.WARNING) as logs:
+            fetch("SELECT 1")
+            fetch("SELECT 1")
+        self.assertEqual(len(logs.records), 2)
+        self.assertTrue(all(record.slow for record in logs.records))
+
+    def test_redaction(self):
+        """Selected positions or names are masked; True masks everything."""
+        @log_queries(redact=(1,))
+        def by_position(query, params):
+            return []
+
+        @log_queries(redact=("password",))
+        def by_name(query, params):
+            return []
+
+        @log_queries(redact=True)
+        def everything(query, params):
+            return []
+
+        with self.assertLogs("queries", logging.INFO) as logs:
+            by_position("SELECT ?, ?", ("a", "secret"))
+            by_name("SELECT :user, :password", {"user": "a", "password": "b"})
+            everything("SELECT ?", ("x",))
+        self.assertEqual(
+            [record.params for record in logs.records],
+            [("a", "***"), {"user": "a", "password": "***"}, "***"],
+        )
+
+    def test_non_query_signature(self):
+        """A function such as get_user(conn, user_id) is never broken."""
+        @log_queries(redact=(0,))
+        def get_user(conn, user_id):
+            return (user_id, "name")
+
+        with self.assertLogs("queries", logging.INFO) as logs:
+            self.assertEqual(get_user(object(), 5), (5, "name"))
+        self.assertIsNone(logs.records[0].query)
+        self.assertIsNone(logs.records[0].params)
+
+    def test_logging_failure_is_swallowed(self):
+        """An error raised while building the record does not reach the caller."""
+        class Unsized:
+            def __len__(self):
+                raise RuntimeError("broken result")
+
+        @log_queries
+        def fetch(query):
+            return result
+
+        result = Unsized()
+        self.assertIs(fetch("SELECT 1"), result)
+
+    def test_errors(self):
+        """Failures are logged at ERROR and re-raised; BaseException passes through."""
+        @log_queries
+        def failing(query):
+            raise ValueError("boom")
+
+        @log_queries
+        def interrupted(query):
+            raise KeyboardInterrupt
+
+        with self.assertLogs("queries", logging.INFO) as logs:
+            with self.assertRaises(ValueError):
+                failing("SELECT 1")
+        self.assertEqual(logs.records[0].levelno, logging.ERROR)
+        self.assertIn("failed: boom: SELECT 1", logs.records[0].getMessage())
+        with self.assertRaises(KeyboardInterrupt):
+            interrupted("SELECT 1")
+
+    def test_disabled_logger_skips_work(self):
+        """With the logger disabled no record is built."""
+        logger = logging.getLogger("queries")
+        level = logger.level
+        logger.setLevel(logging.CRITICAL)
+        try:
+            @log_queries
+            def fetch(query):
+                return []
+
+            with patch.object(logger, "log") as log, \
+                    patch.object(log_queries_module, "_emit") as emit:
+                fetch("SELECT 1")
+            log.assert_not_called()
+            emit.assert_not_called()
+        finally:
+            logger.setLevel(level)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,142 @@
+#!/usr/bin/env python3
+"""Unit tests for result_cache"""
+import sqlite3
+import unittest
+from unittest.mock import patch
+
+import result_cache
+from result_cache import QueryCache
+
+
+class TestTablesRead(unittest.TestCase):
+    """
+    Test case for tables_read.
+    """
+
+    def test_tables(self):
+        """FROM lists, aliases and JOINs are all found."""
+        cases = {
+            "SELECT * FROM users": {"users"},
+            "SELECT * FROM a, b WHERE a.id = b.id": {"a", "b"},
+            'SELECT * FROM a x, "B" AS y JOIN c ON 1': {"a", "b", "c"},
+            "SELECT * FROM users ORDER BY name, age": {"users"},
+            "SELECT 1": set(),
+        }
+        for query, tables in cases.items():
+            self.assertEqual(result_cache.tables_read(query), tables, query)
+
+
+class TestQueryCache(unittest.TestCase):
+    """
+    Test case for QueryCache keys, bounds, expiry and invalidation.
+    """
+
+    def test_named_params_keyed_by_value(self):
+        """{"id": 1} and {"id": 2} are different keys."""
+        one = QueryCache.make_key("db", "SELECT * FROM users WHERE id = :id", {"id": 1})
+        two = QueryCache.make_key("db", "SELECT * FROM users WHERE id = :id", {"id": 2})
+        self.assertNotEqual(one, two)
+
+    def test_literal_whitespace_is_significant(self):
+        """Literals that differ only in inner whitespace are different keys."""
+        one = QueryCache.make_key("db", "SELECT * FROM users WHERE name = 'a b'")
+        two = QueryCache.make_key("db", "SELECT * FROM users WHERE name = 'a  b'")
+        self.assertNotEqual(one, two)
+
+    def test_unhashable_params_not_cached(self):
+        """A list parameter yields no key, and set/get ignore it."""
+        cache = QueryCache()
+        key = QueryCache.make_key("db", "SELECT * FROM users", ([1, 2],))
+        self.assertIsNone(key)
+        cache.set(key, [(1,)])
+        self.assertEqual(cache.get(key), (False, None))
+        self.assertEqual(cache.info()["entries"], 0)
+
+    def test_lru_eviction(self):
+        """The least recently used entry goes first once max_entries is hit."""
+        cache = QueryCache(max_entries=2)
+        keys = [QueryCache.make_key("db", f"SELECT {i} FROM t") for i in range(3)]
+        cache.set(keys[0], [0])
+        cache.set(keys[1], [1])
+        cache.get(keys[0])
+        cache.set(keys[2], [2])
+        self.assertEqual(cache.get(keys[1]), (False, None))
+        self.assertEqual(cache.get(keys[0]), (True, [0]))
+        self.assertEqual(cache.info()["evictions"], 1)
+
+    def test_byte_bound(self):
+        """Entries larger than max_bytes are not stored."""
+        cache = QueryCache(max_bytes=1000)
+        key = QueryCache.make_key("db", "SELECT * FROM t")
+        cache.set(key, [("x" * 2000,)])
+        self.assertEqual(cache.info()["entries"], 0)
+
+    def test_ttl(self):
+        """Entries expire ttl seconds after they were stored."""
+        cache = QueryCache(ttl=10)
+        key = QueryCache.make_key("db", "SELECT * FROM t")
+        with patch.object(result_cache.time, "monotonic", return_value=100.0):
+            cache.set(key, [1])
+        with patch.object(result_cache.time, "monotonic", return_value=105.0):
+            self.assertEqual(cache.get(key), (True, [1]))
+        with patch.object(result_cache.time, "monotonic", return_value=111.0):
+            self.assertEqual(cache.get(key), (False, None))
+        self.assertEqual(cache.info()["expirations"], 1)
+
+    def test_invalidate(self):
+        """Only entries of the same database that read the tables are dropped."""
+        cache = QueryCache()
+        joined = QueryCache.make_key("db", "SELECT * FROM a, b")
+        other = QueryCache.make_key("db", "SELECT * FROM c")
+        elsewhere = QueryCache.make_key("db2", "SELECT * FROM b")
+        for key in (joined, other, elsewhere):
+            cache.set(key, [1])
+        cache.invalidate("db", {"B"})
+        self.assertEqual(cache.get(joined), (False, None))
+        self.assertEqual(cache.get(other), (True, [1]))
+        self.assertEqual(cache.get(elsewhere), (True, [1]))
+
+
+class TestWriteTracking(unittest.TestCase):
+    """
+    Test case for watch_writes and commit/rollback invalidation.
+    """
+
+    def setUp(self):
+        self.conn = sqlite3.connect(":memory:")
+        self.conn.execute("CREATE TABLE users (id INTEGER PRIMARY KEY, email TEXT)")
+        self.cache = QueryCache()
+        self.key = QueryCache.make_key(
+            result_cache.database_id(self.conn), "SELECT * FROM users"
+        )
+        self.cache.set(self.key, [])
+
+    def tearDown(self):
+        self.conn.close()
+
+    def test_commit_invalidates(self):
+        """A committed write drops cached reads of the written table."""
+        result_cache.watch_writes(self.conn)
+        self.conn.execute("INSERT INTO users (email) VALUES ('a')")
+        self.conn.commit()
+        result_cache.writes_committed(self.conn, self.cache)
+        self.assertEqual(self.cache.get(self.key), (False, None))
+
+    def test_rollback_keeps_cache(self):
+        """A rolled back write leaves the cache alone."""
+        result_cache.watch_writes(self.conn)
+        self.conn.execute("INSERT INTO users (email) VALUES ('a')")
+        self.conn.rollback()
+        result_cache.writes_rolled_back(self.conn)
+        self.assertEqual(self.cache.get(self.key), (True, []))
+
+    def test_untracked_writes_ignored(self):
+        """Writes outside watch_writes are not recorded."""
+        self.conn.execute("INSERT INTO users (email) VALUES ('a')")
+        self.conn.commit()
+        result_cache.writes_committed(self.conn, self.cache)
+        self.assertEqual(self.cache.get(self.key), (True, []))
+
+
+if __name__ == "__main__":
+    unittest.main()
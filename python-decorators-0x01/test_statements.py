@@ -0,0 +1,134 @@
+#!/usr/bin/env python3
+"""Unit tests for statements"""
+import os
+import sqlite3
+import tempfile
+import unittest
+
+import db_pool
+import result_cache
+import statements
+
+
+class TestStatementRegistry(unittest.TestCase):
+    """
+    Test case for declaring statements and their counters.
+    """
+
+    def setUp(self):
+        self.registry = statements.StatementRegistry()
+        self.conn = sqlite3.connect(":memory:")
+        self.conn.execute("CREATE TABLE users (id INTEGER PRIMARY KEY, email TEXT)")
+        self.conn.executemany(
+            "INSERT INTO users (id, email) VALUES (?, ?)", [(1, "a"), (2, "b")]
+        )
+
+    def tearDown(self):
+        self.conn.close()
+
+    def test_redeclare_same_sql(self):
+        """Declaring a name again, even with other whitespace, returns it."""
+        first = self.registry.declare("by_id", "SELECT * FROM users WHERE id = ?")
+        again = self.registry.declare("by_id", "SELECT *\n  FROM users WHERE id = ?")
+        self.assertIs(first, again)
+        self.assertIs(self.registry["by_id"], first)
+        self.assertEqual(first.sql, "SELECT * FROM users WHERE id = ?")
+
+    def test_sql_stored_unchanged(self):
+        """Whitespace inside literals is kept, and counts when redeclaring."""
+        sql = "SELECT id FROM users WHERE email = 'a  b'\n  AND id > ?"
+        statement = self.registry.declare("by_email", sql)
+        self.assertEqual(statement.sql, sql)
+        with self.assertRaises(ValueError):
+            self.registry.declare(
+                "by_email", "SELECT id FROM users WHERE email = 'a b' AND id > ?"
+            )
+
+    def test_redeclare_different_sql(self):
+        """Reusing a name for different SQL is refused."""
+        self.registry.declare("by_id", "SELECT * FROM users WHERE id = ?")
+        with self.assertRaises(ValueError):
+            self.registry.declare("by_id", "SELECT id FROM users WHERE id = ?")
+
+    def test_counters(self):
+        """Calls, rows and errors are recorded per statement."""
+        by_id = self.registry.declare("by_id", "SELECT * FROM users WHERE id = ?")
+        update = self.registry.declare("update", "UPDATE users SET email = ? WHERE id = ?")
+        self.assertEqual(by_id.fetchone(self.conn, (1,)), (1, "a"))
+        self.assertIsNone(by_id.fetchone(self.conn, (9,)))
+        self.assertEqual(update.run(self.conn, ("c", 2)).rowcount, 1)
+        with self.assertRaises(sqlite3.Error):
+            by_id.fetchone(self.conn, ())
+
+        info = {entry["name"]: entry for entry in self.registry.stats()}
+        self.assertEqual(info["by_id"]["calls"], 3)
+        self.assertEqual(info["by_id"]["rows"], 1)
+        self.assertEqual(info["by_id"]["errors"], 1)
+        self.assertEqual(info["update"]["rows"], 1)
+
+        self.registry.reset()
+        self.assertEqual(by_id.info()["calls"], 0)
+
+
+class CountingConnection(sqlite3.Connection):
+    """Connection that counts set_authorizer calls, which expire statements."""
+
+    authorizer_calls = 0
+
+    def set_authorizer(self, authorizer):
+        self.authorizer_calls += 1
+        super().set_authorizer(authorizer)
+
+
+class TestStatementReuse(unittest.TestCase):
+    """
+    Test case for statement reuse on pooled connections under write tracking.
+    """
+
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        path = os.path.join(self.tmp.name, "app.db")
+        conn = sqlite3.connect(path)
+        conn.execute("CREATE TABLE users (id INTEGER PRIMARY KEY, email TEXT)")
+        conn.execute("INSERT INTO users (id, email) VALUES (1, 'a')")
+        conn.commit()
+        conn.close()
+        self.pool = db_pool.SQLitePool(path, size=1, factory=CountingConnection)
+
+    def tearDown(self):
+        self.pool.close_all()
+        self.tmp.cleanup()
+
+    def test_watch_writes_keeps_statements_prepared(self):
+        """Transactional write tracking does not force a re-prepare."""
+        update = statements.Statement("update", "UPDATE users SET email = ? WHERE id = ?")
+        prepares = []
+        conn = self.pool.acquire()
+        # The authorizer only runs while SQLite compiles a statement
+        def authorizer(action, *args):
+            if action == sqlite3.SQLITE_UPDATE:
+                prepares.append(args)
+            return sqlite3.SQLITE_OK
+
+        conn.set_authorizer(authorizer)
+        self.pool.release(conn)
+
+        cache = result_cache.QueryCache()
+        for email in ("b", "c", "d"):
+            conn = self.pool.acquire()
+            key = cache.make_key(result_cache.database_id(conn), "SELECT * FROM users")
+            cache.set(key, [(1, "a")])
+            result_cache.watch_writes(conn)
+            update.run(conn, (email, 1))
+            conn.commit()
+            result_cache.writes_committed(conn, cache)
+            self.pool.release(conn)
+            self.assertEqual(cache.get(key), (False, None))
+            if email == "b":
+                prepared_once = len(prepares)
+        self.assertEqual(len(prepares), prepared_once)
+        self.assertEqual(conn.authorizer_calls, 1)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -2,13 +2,26 @@ seed = __import__('seed')
 
 def stream_users():
     """Generator that streams rows from user_data table one at a time."""
-    connection = seed.connect_to_prodev()
+    connection = seed.get_connection()
     cursor = connection.cursor()
 
-    cursor.execute("SELECT * FROM user_data")
+    try:
+        cursor.execute(f"SELECT {seed.USER_COLUMNS} FROM user_data")
 
-    for row in cursor:
-        yield row
+        for row in cursor:
+            yield row
 
-    cursor.close()
-    connection.close()
\ No newline at end of file
+        cursor.close()
+    finally:
+        # hand the connection back to the pool even if the consumer stops early
+        connection.close()
+
+
+def stream_users_unbuffered(prefetch=500, memory_limit=None):
+    """
+    Generator that streams user_data rows through an unbuffered cursor,
+    holding at most prefetch rows (and memory_limit bytes) on the client.
+    """
+    yield from seed.stream_rows(
+        f"SELECT {seed.USER_COLUMNS} FROM user_data", None, prefetch, memory_limit
+    )
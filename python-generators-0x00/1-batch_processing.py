@@ -1,31 +1,161 @@
+import queue
+import threading
+import time
+
 seed = __import__('seed')
+pushdown = __import__('pushdown')
+partitions = __import__('partitions')
+columnar_format = __import__('columnar')
 
-def stream_users_in_batches(batch_size):
+def stream_users_in_batches(batch_size, columnar=False):
     """
     Generator that yields batches of rows from user_data table.
-    Each batch is a list of rows.
+    Each batch is a list of rows, or a dict of per-column arrays when
+    columnar is true (see columnar.to_columns).
     """
-    connection = seed.connect_to_prodev()
+    connection = seed.get_connection()
     cursor = connection.cursor()
 
-    cursor.execute("SELECT * FROM user_data")
+    try:
+        cursor.execute(f"SELECT {seed.USER_COLUMNS} FROM user_data")
+
+        while True:
+            batch = cursor.fetchmany(batch_size)
+            if not batch:
+                break
+            yield columnar_format.to_columns(batch) if columnar else batch
+
+        cursor.close()
+    finally:
+        # hand the connection back to the pool even if the consumer stops early
+        connection.close()
+
+
+def stream_users_in_batches_unbuffered(batch_size, memory_limit=None):
+    """
+    Like stream_users_in_batches but reads through an unbuffered cursor so
+    only the current batch is ever held on the client. With memory_limit
+    (bytes) set, batches shrink to stay under it.
+    """
+    yield from seed.stream_batches(
+        f"SELECT {seed.USER_COLUMNS} FROM user_data", None, batch_size, memory_limit
+    )
+
+
+class PrefetchingBatches:
+    """
+    Iterator over user_data batches where a background thread keeps up to
+    depth batches fetched ahead, so database reads overlap with the
+    consumer's work. stats records how long each side spent waiting.
+    """
+
+    _DONE = object()
+
+    def __init__(self, batch_size, depth=2, source=None):
+        self._queue = queue.Queue(depth)
+        self._stop = threading.Event()
+        self._source = source or stream_users_in_batches_unbuffered
+        self.stats = {
+            "batches": 0,
+            "consumer_wait_seconds": 0.0,
+            "producer_wait_seconds": 0.0,
+        }
+        self._thread = threading.Thread(
+            target=self._produce, args=(batch_size,), daemon=True
+        )
+        self._thread.start()
 
-    while True:
-        batch = cursor.fetchmany(batch_size)
-        if not batch:
-            break
-        yield batch
+    def _produce(self, batch_size):
+        batches = self._source(batch_size)
+        try:
+            for batch in batches:
+                if not self._put(batch):
+                    return
+        except Exception as err:
+            self._put(err)
+            return
+        finally:
+            # closes the source generator, returning its pooled connection
+            if hasattr(batches, "close"):
+                batches.close()
+        self._put(self._DONE)
 
-    cursor.close()
-    connection.close()
+    def _put(self, item):
+        start = time.perf_counter()
+        try:
+            while not self._stop.is_set():
+                try:
+                    self._queue.put(item, timeout=0.1)
+                    return True
+                except queue.Full:
+                    continue
+            return False
+        finally:
+            self.stats["producer_wait_seconds"] += time.perf_counter() - start
+
+    def __iter__(self):
+        return self
+
+    def __next__(self):
+        if self._stop.is_set():
+            raise StopIteration
+        start = time.perf_counter()
+        item = self._queue.get()
+        self.stats["consumer_wait_seconds"] += time.perf_counter() - start
+        if item is self._DONE:
+            self.close()
+            raise StopIteration
+        if isinstance(item, Exception):
+            self.close()
+            raise item
+        self.stats["batches"] += 1
+        return item
+
+    def close(self):
+        """Stops the background reader and releases its connection."""
+        self._stop.set()
+        self._thread.join()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+
+def stream_users_in_batches_prefetch(batch_size, depth=2, source=None):
+    """
+    Generator like stream_users_in_batches that fetches up to depth batches
+    ahead on a background thread. Stopping early (break, close()) stops the
+    thread and hands its connection back to the pool. Use PrefetchingBatches
+    directly to read its wait stats.
+    """
+    prefetcher = PrefetchingBatches(batch_size, depth, source)
+    try:
+        yield from prefetcher
+    finally:
+        prefetcher.close()
 
 
 def batch_processing(batch_size):
     """
     Processes user_data in batches and yields users with age > 25.
     """
-    for batch in stream_users_in_batches(batch_size):
-        filtered = [row for row in batch if float(row[3]) > 25]  
-        for user in filtered:  # loop 3
+    # The age filter runs in MySQL so only matching rows cross the wire
+    where, params = pushdown.compile_where([pushdown.Predicate("age", ">", 25)])
+    for batch in seed.stream_batches(
+        f"SELECT {seed.USER_COLUMNS} FROM user_data{where}", params, batch_size
+    ):
+        for user in batch:
             yield user
     return
+
+
+def batch_processing_parallel(batch_size, partitions_count=4):
+    """
+    Same result as batch_processing, but reads user_data as several key
+    ranges on concurrent connections.
+    """
+    yield from partitions.parallel_scan(
+        partitions_count, batch_size, [pushdown.Predicate("age", ">", 25)]
+    )
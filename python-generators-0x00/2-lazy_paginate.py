@@ -1,24 +1,81 @@
+import base64
+import json
+
 seed = __import__('seed')
 
+# Columns the keyset paginator may seek on; they must be indexed
+SORT_KEYS = ("user_id",)
+
 
 def paginate_users(page_size, offset):
     """Fetch one page of user data from offset."""
-    connection = seed.connect_to_prodev()
+    connection = seed.get_connection()
     cursor = connection.cursor()
-    cursor.execute("SELECT * FROM user_data LIMIT %s OFFSET %s", (page_size, offset))
+    cursor.execute(f"SELECT {seed.USER_COLUMNS} FROM user_data LIMIT %s OFFSET %s", (page_size, offset))
     results = cursor.fetchall()
     cursor.close()
     connection.close()
     return results
 
 
+def encode_cursor(key, last_seen):
+    """Builds an opaque token recording where a keyset walk stopped."""
+    payload = json.dumps({"key": key, "last": seed.key_to_json(last_seen)}).encode()
+    return base64.urlsafe_b64encode(payload).decode()
+
+
+def decode_cursor(token):
+    """Returns the (key, last_seen) pair stored in a cursor token."""
+    payload = json.loads(base64.urlsafe_b64decode(token.encode()))
+    return payload["key"], seed.key_from_json(payload["last"])
+
+
+def paginate_users_keyset(connection, page_size, key="user_id", last_seen=None):
+    """Fetch the page of user data that follows last_seen in key order."""
+    if key not in SORT_KEYS:
+        raise ValueError(f"Cannot paginate on unindexed column {key!r}")
+
+    cursor = connection.cursor()
+    if last_seen is None:
+        cursor.execute(
+            f"SELECT {seed.USER_COLUMNS} FROM user_data ORDER BY {key} LIMIT %s", (page_size,)
+        )
+    else:
+        cursor.execute(
+            f"SELECT {seed.USER_COLUMNS} FROM user_data WHERE {key} > %s ORDER BY {key} LIMIT %s",
+            (last_seen, page_size),
+        )
+    results = cursor.fetchall()
+    key_index = cursor.column_names.index(key)
+    cursor.close()
+    return results, key_index
+
+
+def lazy_paginate_with_cursor(page_size, cursor=None, key="user_id"):
+    """
+    Generator that walks user_data with keyset pagination on one connection.
+    Yields (page, token) pairs; passing a token back in as cursor resumes
+    the walk right after that page.
+    """
+    last_seen = None
+    if cursor is not None:
+        key, last_seen = decode_cursor(cursor)
+
+    connection = seed.get_connection()
+    try:
+        while True:
+            page, key_index = paginate_users_keyset(
+                connection, page_size, key, last_seen
+            )
+            if not page:
+                break
+            last_seen = page[-1][key_index]
+            yield page, encode_cursor(key, last_seen)
+    finally:
+        connection.close()
+
+
 def lazy_paginate(page_size):
     """Generator that lazily paginates user data one page at a time."""
-    offset = 0
-    while True:  
-        page = paginate_users(page_size, offset)
-        if not page:
-            break
+    for page, _ in lazy_paginate_with_cursor(page_size):
         yield page
-        offset += page_size
-
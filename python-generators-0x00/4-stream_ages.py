@@ -1,30 +1,45 @@
 seed = __import__('seed')
+pushdown = __import__('pushdown')
+stats = __import__('stats')
 
 def stream_user_ages():
     """Generator that yields user ages one at a time."""
-    connection = seed.connect_to_prodev()
+    connection = seed.get_connection()
     cursor = connection.cursor()
-    cursor.execute("SELECT age FROM user_data")
+    try:
+        cursor.execute("SELECT age FROM user_data")
 
-    for (age,) in cursor:  
-        yield float(age)   
+        for (age,) in cursor:
+            yield float(age)
 
-    cursor.close()
-    connection.close()
+        cursor.close()
+    finally:
+        # hand the connection back to the pool even if the consumer stops early
+        connection.close()
 
 
 def calculate_average_age():
-    """Calculates average age using the generator without loading all data."""
-    total = 0
-    count = 0
+    """Calculates average age in MySQL so only one row comes back."""
+    result = pushdown.aggregate(("avg", "count"), "age")
 
-    for age in stream_user_ages():  
-        total += age
-        count += 1
-
-    if count == 0:
+    if result["count"] == 0:
         print("No users found.")
     else:
-        average = total / count
-        print(f"Average age of users: {average:.2f}")
+        print(f"Average age of users: {result['avg']:.2f}")
+
 
+def age_statistics(state_path="age_stats.json"):
+    """
+    Prints mean, spread and quantiles of user ages, scanning only rows changed
+    since the state in state_path was last saved.
+    """
+    summary = stats.update_age_stats(state_path).summary()
+    if summary["count"] == 0:
+        print("No users found.")
+        return summary
+    quantiles = ", ".join(
+        f"p{int(p * 100)}={value:.2f}" for p, value in summary["quantiles"].items()
+    )
+    print(f"Users: {summary['count']}, mean age {summary['mean']:.2f}, "
+          f"min {summary['min']:.2f}, max {summary['max']:.2f}, {quantiles}")
+    return summary
@@ -0,0 +1,123 @@
+import asyncio
+import threading
+
+try:
+    import aiomysql
+except ImportError:  # aiomysql is optional; fall back to a worker thread
+    aiomysql = None
+
+seed = __import__('seed')
+
+_DONE = object()
+
+
+class _Failure:
+    """Carries an exception from the producer thread to the event loop."""
+
+    def __init__(self, error):
+        self.error = error
+
+
+async def offload(factory, *args, maxsize=4):
+    """
+    Async generator over a blocking generator factory(*args) that runs in a
+    dedicated thread. At most maxsize items are buffered; the thread blocks
+    when the consumer falls behind, so memory stays bounded.
+    """
+    loop = asyncio.get_running_loop()
+    queue = asyncio.Queue(maxsize)
+    stop = threading.Event()
+
+    def put(item):
+        asyncio.run_coroutine_threadsafe(queue.put(item), loop).result()
+
+    def produce():
+        items = factory(*args)
+        try:
+            for item in items:
+                if stop.is_set():
+                    return
+                put(item)
+        except Exception as err:
+            if not stop.is_set():
+                put(_Failure(err))
+            return
+        finally:
+            items.close()
+        if not stop.is_set():
+            put(_DONE)
+
+    thread = threading.Thread(target=produce, daemon=True)
+    thread.start()
+    try:
+        while True:
+            item = await queue.get()
+            if item is _DONE:
+                break
+            if isinstance(item, _Failure):
+                raise item.error
+            yield item
+    finally:
+        stop.set()
+        # Free a slot so a producer blocked on a full queue can see stop
+        while not queue.empty():
+            queue.get_nowait()
+        await loop.run_in_executor(None, thread.join)
+
+
+async def _native_batches(query, batch_size):
+    """Async generator over query results on an aiomysql server-side cursor."""
+    config = dict(seed.PRODEV_CONFIG)
+    config["db"] = config.pop("database")
+    connection = await aiomysql.connect(**config)
+    exhausted = False
+    try:
+        cursor = await connection.cursor(aiomysql.SSCursor)
+        await cursor.execute(query)
+        while True:
+            batch = await cursor.fetchmany(batch_size)
+            if not batch:
+                exhausted = True
+                break
+            yield batch
+    finally:
+        if exhausted:
+            await cursor.close()
+            await connection.ensure_closed()
+        else:
+            # Closing the cursor would read every remaining row first;
+            # close() drops the socket instead, as seed.stream_batches does
+            connection.close()
+
+
+async def astream_users_in_batches(batch_size, maxsize=4):
+    """
+    Async generator that yields batches of user_data rows. Uses aiomysql
+    when installed, otherwise the unbuffered reader on a worker thread.
+    """
+    if aiomysql is not None:
+        batches = _native_batches(
+            f"SELECT {seed.USER_COLUMNS} FROM user_data", batch_size
+        )
+    else:
+        batches = offload(
+            __import__('1-batch_processing').stream_users_in_batches_unbuffered,
+            batch_size,
+            maxsize=maxsize,
+        )
+    try:
+        async for batch in batches:
+            yield batch
+    finally:
+        await batches.aclose()
+
+
+async def astream_users(prefetch=500, maxsize=4):
+    """Async generator that yields user_data rows one at a time."""
+    batches = astream_users_in_batches(prefetch, maxsize)
+    try:
+        async for batch in batches:
+            for row in batch:
+                yield row
+    finally:
+        await batches.aclose()
@@ -0,0 +1,148 @@
+"""
+Benchmarks the user_data generators against a local ALX_prodev database.
+
+    python benchmark.py --rows 100000 --batch-sizes 100,1000 --output bench.jsonl
+
+Each reader runs in its own process so peak RSS is measured per reader.
+Results are written as JSON lines, one per reader/size combination.
+"""
+import argparse
+import json
+import multiprocessing
+import platform
+import resource
+import sys
+import time
+
+seed = __import__('seed')
+synth = __import__('synth')
+
+
+def _count_rows(connection):
+    cursor = connection.cursor()
+    cursor.execute("SELECT COUNT(*) FROM user_data")
+    (count,) = cursor.fetchone()
+    cursor.close()
+    return count
+
+
+def ensure_rows(rows, random_seed=42):
+    """Tops user_data up with synthetic rows until it holds at least rows."""
+    connection = seed.get_connection()
+    try:
+        existing = _count_rows(connection)
+    finally:
+        connection.close()
+    if existing < rows:
+        synth.insert_rows(existing, rows, random_seed)
+    return max(existing, rows)
+
+
+def _readers(batch_sizes, page_sizes):
+    """(name, size, factory) for every reader/size combination to time."""
+    stream = __import__('0-stream_users')
+    batches = __import__('1-batch_processing')
+    pages = __import__('2-lazy_paginate')
+    ages = __import__('4-stream_ages')
+
+    yield "stream_users", None, stream.stream_users
+    yield "stream_users_unbuffered", None, stream.stream_users_unbuffered
+    yield "stream_user_ages", None, ages.stream_user_ages
+    for size in batch_sizes:
+        yield "stream_users_in_batches", size, lambda s=size: batches.stream_users_in_batches(s)
+    for size in page_sizes:
+        yield "lazy_paginate", size, lambda s=size: pages.lazy_paginate(s)
+
+
+def _measure(factory, sized, conn):
+    """
+    Child process body: drains one reader and sends back its timings, or
+    {"error": ...} if the reader failed.
+    """
+    try:
+        start = time.perf_counter()
+        first = None
+        rows = 0
+        for item in factory():
+            if first is None:
+                first = time.perf_counter() - start
+            rows += len(item) if sized else 1
+        elapsed = time.perf_counter() - start
+        # ru_maxrss is in KiB on Linux
+        peak_rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss * 1024
+        conn.send({
+            "rows": rows,
+            "seconds": elapsed,
+            "time_to_first_row": first,
+            "rows_per_sec": rows / elapsed if elapsed else None,
+            "peak_rss_bytes": peak_rss,
+        })
+    except Exception as err:
+        conn.send({"error": f"{type(err).__name__}: {err}"})
+    finally:
+        conn.close()
+
+
+def _receive(receiver, process):
+    """The child's record; an error record if it died without sending one."""
+    try:
+        return receiver.recv()
+    except EOFError:
+        process.join()
+        return {"error": f"reader process exited with code {process.exitcode}"}
+    finally:
+        receiver.close()
+
+
+def run(rows, batch_sizes, page_sizes, output=None):
+    """Seeds the table, times every reader and returns the result records."""
+    total = ensure_rows(rows)
+    seed.get_pool().close_all()
+
+    context = multiprocessing.get_context("fork")
+    meta = {
+        "table_rows": total,
+        "python": platform.python_version(),
+        "timestamp": time.time(),
+    }
+    results = []
+    out = open(output, "a", encoding="utf-8") if output else sys.stdout
+    try:
+        for name, size, factory in _readers(batch_sizes, page_sizes):
+            receiver, sender = context.Pipe(duplex=False)
+            process = context.Process(
+                target=_measure, args=(factory, size is not None, sender)
+            )
+            process.start()
+            # Only the child may hold the write end, or recv() never sees EOF
+            sender.close()
+            record = dict(meta, reader=name, size=size, **_receive(receiver, process))
+            process.join()
+            results.append(record)
+            out.write(json.dumps(record) + "\n")
+            out.flush()
+    finally:
+        if output:
+            out.close()
+    return results
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--rows", type=int, default=10000,
+                        help="minimum rows in user_data (10k to 10M)")
+    parser.add_argument("--batch-sizes", default="100,1000,10000")
+    parser.add_argument("--page-sizes", default="100,1000,10000")
+    parser.add_argument("--output", help="append JSON lines here instead of stdout")
+    args = parser.parse_args(argv)
+
+    run(
+        args.rows,
+        [int(size) for size in args.batch_sizes.split(",")],
+        [int(size) for size in args.page_sizes.split(",")],
+        args.output,
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,76 @@
+from array import array
+
+try:
+    import numpy as np
+except ImportError:  # numpy is optional; fall back to array.array
+    np = None
+
+pushdown = __import__('pushdown')
+
+
+def to_columns(batch):
+    """
+    Converts a list of user_data row tuples into a dict of per-column arrays.
+    age becomes a float64 NumPy array (or array('d') without NumPy); the
+    string columns stay as plain lists.
+    """
+    user_ids, names, emails, ages = zip(*batch) if batch else ((), (), (), ())
+    if np is not None:
+        age_column = np.fromiter((float(age) for age in ages), dtype=np.float64, count=len(ages))
+    else:
+        age_column = array('d', (float(age) for age in ages))
+    return {
+        "user_id": list(user_ids),
+        "name": list(names),
+        "email": list(emails),
+        "age": age_column,
+    }
+
+
+def select_rows(columns, mask):
+    """Returns the columns restricted to positions where mask is true."""
+    if np is not None:
+        mask = np.asarray(mask, dtype=bool)
+        picked = np.flatnonzero(mask)
+        return {
+            name: values[mask] if isinstance(values, np.ndarray)
+            else [values[i] for i in picked]
+            for name, values in columns.items()
+        }
+    return {
+        name: type(values)(values.typecode, (v for v, keep in zip(values, mask) if keep))
+        if isinstance(values, array)
+        else [v for v, keep in zip(values, mask) if keep]
+        for name, values in columns.items()
+    }
+
+
+def age_mask(columns, op, value):
+    """Evaluates `age op value` over a whole column at once."""
+    compare = pushdown.OPERATORS[op]
+    ages = columns["age"]
+    if np is not None:
+        return compare(ages, value)
+    return [compare(age, value) for age in ages]
+
+
+def batch_processing_columnar(batch_size, min_age=25):
+    """Generator that yields columnar batches of users older than min_age."""
+    batches = __import__('1-batch_processing').stream_users_in_batches(
+        batch_size, columnar=True
+    )
+    for columns in batches:
+        filtered = select_rows(columns, age_mask(columns, ">", min_age))
+        if len(filtered["age"]):
+            yield filtered
+
+
+def average_age(batches):
+    """Mean age over an iterable of columnar batches."""
+    total = 0.0
+    count = 0
+    for columns in batches:
+        ages = columns["age"]
+        total += float(np.sum(ages)) if np is not None else sum(ages)
+        count += len(ages)
+    return total / count if count else None
@@ -0,0 +1,214 @@
+"""
+Streaming export of user_data to NDJSON, CSV, Parquet/Arrow IPC, or a
+simple chunked binary format, with optional gzip/zstd compression.
+
+Only one batch is held in memory at a time. export_partitioned writes one
+file per user_id range in parallel.
+
+Chunked binary layout (used when pyarrow is not installed), after the
+4-byte magic b"UDC1", repeated per batch:
+
+    <I rows> <I names_len> <I emails_len>
+    user_ids (16 * rows bytes) | ages (8 * rows float64) |
+    names (utf-8, NUL separated) | emails (utf-8, NUL separated)
+"""
+import csv
+import gzip
+import io
+import json
+import struct
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+
+try:
+    import pyarrow
+    import pyarrow.ipc
+    import pyarrow.parquet
+except ImportError:  # pyarrow is optional
+    pyarrow = None
+
+try:
+    import zstandard
+except ImportError:  # zstandard is optional
+    zstandard = None
+
+rows_format = __import__('rows')
+partitions = __import__('partitions')
+
+FORMATS = ("ndjson", "csv", "parquet", "arrow", "chunked")
+COLUMNS = ("user_id", "name", "email", "age")
+MAGIC = b"UDC1"
+_CHUNK_HEADER = struct.Struct("<III")
+
+
+def _open_output(path, compression):
+    """Opens path for binary writing through the requested compressor."""
+    if compression is None:
+        return open(path, "wb")
+    if compression == "gzip":
+        return gzip.open(path, "wb", compresslevel=6)
+    if compression == "zstd":
+        if zstandard is None:
+            raise ValueError("zstd compression needs the zstandard package")
+        return zstandard.ZstdCompressor().stream_writer(open(path, "wb"))
+    raise ValueError(f"Unknown compression {compression!r}")
+
+
+def _default_batches(batch_size):
+    return __import__('1-batch_processing').stream_users_in_batches_unbuffered(batch_size)
+
+
+def _text_rows(batch):
+    """Rows with binary user_ids rendered as the usual UUID string."""
+    for user_id, name, email, age in batch:
+        if isinstance(user_id, (bytes, bytearray)):
+            user_id = str(uuid.UUID(bytes=bytes(user_id)))
+        yield user_id, name, email, age
+
+
+def _write_ndjson(out, batches):
+    text = io.TextIOWrapper(out, encoding="utf-8", newline="\n")
+    count = 0
+    for batch in batches:
+        for user_id, name, email, age in _text_rows(batch):
+            record = {"user_id": user_id, "name": name, "email": email, "age": float(age)}
+            text.write(json.dumps(record) + "\n")
+        count += len(batch)
+    text.flush()
+    text.detach()
+    return count
+
+
+def _write_csv(out, batches):
+    text = io.TextIOWrapper(out, encoding="utf-8", newline="")
+    writer = csv.writer(text)
+    writer.writerow(COLUMNS)
+    count = 0
+    for batch in batches:
+        writer.writerows(_text_rows(batch))
+        count += len(batch)
+    text.flush()
+    text.detach()
+    return count
+
+
+def _write_chunked(out, batches):
+    out.write(MAGIC)
+    count = 0
+    for batch in batches:
+        packed = rows_format.UserBatch.from_rows(batch)
+        names = "\0".join(packed.names).encode("utf-8")
+        emails = "\0".join(packed.emails).encode("utf-8")
+        out.write(_CHUNK_HEADER.pack(len(packed), len(names), len(emails)))
+        out.write(packed.user_ids)
+        out.write(packed.ages.tobytes())
+        out.write(names)
+        out.write(emails)
+        count += len(packed)
+    return count
+
+
+def read_chunked(path, compression=None):
+    """Generator that yields UserBatch objects back from a chunked file."""
+    if compression == "gzip":
+        f = gzip.open(path, "rb")
+    elif compression == "zstd":
+        f = zstandard.ZstdDecompressor().stream_reader(open(path, "rb"))
+    else:
+        f = open(path, "rb")
+    with f:
+        if f.read(len(MAGIC)) != MAGIC:
+            raise ValueError(f"{path} is not a chunked user_data export")
+        while True:
+            header = f.read(_CHUNK_HEADER.size)
+            if not header:
+                break
+            count, names_len, emails_len = _CHUNK_HEADER.unpack(header)
+            batch = rows_format.UserBatch(user_ids=f.read(16 * count))
+            batch.ages.frombytes(f.read(8 * count))
+            names = f.read(names_len).decode("utf-8")
+            emails = f.read(emails_len).decode("utf-8")
+            batch.names = names.split("\0") if count else []
+            batch.emails = emails.split("\0") if count else []
+            yield batch
+
+
+def _arrow_table(batch):
+    user_ids, names, emails, ages = zip(*_text_rows(batch))
+    return pyarrow.table({
+        "user_id": list(user_ids),
+        "name": list(names),
+        "email": list(emails),
+        "age": [float(age) for age in ages],
+    })
+
+
+def _write_arrow(path, batches, fmt, compression):
+    """Writes Parquet or Arrow IPC, letting pyarrow apply the compression."""
+    codec = {"gzip": "gzip", "zstd": "zstd", None: None}[compression]
+    writer = None
+    count = 0
+    try:
+        for batch in batches:
+            if not batch:
+                continue
+            table = _arrow_table(batch)
+            if writer is None:
+                if fmt == "parquet":
+                    writer = pyarrow.parquet.ParquetWriter(
+                        path, table.schema, compression=codec or "none"
+                    )
+                else:
+                    # Arrow IPC only supports lz4/zstd buffer compression
+                    options = pyarrow.ipc.IpcWriteOptions(
+                        compression="zstd" if codec else None
+                    )
+                    writer = pyarrow.ipc.new_file(path, table.schema, options=options)
+            writer.write_table(table)
+            count += len(batch)
+    finally:
+        if writer is not None:
+            writer.close()
+    return count
+
+
+def export(path, fmt="ndjson", compression=None, batch_size=10000, batches=None):
+    """
+    Streams user_data (or the given iterable of row batches) into path.
+    fmt is one of FORMATS; parquet/arrow fall back to the chunked binary
+    format when pyarrow is missing. Returns the number of rows written.
+    """
+    if fmt not in FORMATS:
+        raise ValueError(f"Unknown format {fmt!r}")
+    if batches is None:
+        batches = _default_batches(batch_size)
+    if fmt in ("parquet", "arrow"):
+        if pyarrow is not None:
+            return _write_arrow(path, batches, fmt, compression)
+        fmt = "chunked"
+
+    writers = {"ndjson": _write_ndjson, "csv": _write_csv, "chunked": _write_chunked}
+    with _open_output(path, compression) as out:
+        return writers[fmt](out, batches)
+
+
+def export_partitioned(path_template, fmt="ndjson", compression=None,
+                       partition_count=4, batch_size=10000, workers=None):
+    """
+    Writes user_data to one file per user_id range, in parallel.
+    path_template must contain "{part}", e.g. "users-{part}.ndjson.gz".
+    Returns the list of (path, rows_written).
+    """
+    ranges = partitions.prefix_ranges(partition_count)
+    paths = [path_template.format(part=i) for i in range(len(ranges))]
+
+    def write_part(index):
+        low, high = ranges[index]
+        batches = partitions.scan_partition(low, high, batch_size)
+        return export(paths[index], fmt, compression, batches=batches)
+
+    # one pooled connection per worker, so no more workers than the pool holds
+    workers = min(workers or len(ranges), partitions.seed.get_pool().max_size)
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        counts = list(pool.map(write_part, range(len(ranges))))
+    return list(zip(paths, counts))
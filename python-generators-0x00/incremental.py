@@ -0,0 +1,53 @@
+import json
+import os
+
+seed = __import__('seed')
+
+
+def load_checkpoint(path):
+    """Returns the saved (updated_at, user_id) high-water mark, or None."""
+    if not os.path.exists(path):
+        return None
+    with open(path, encoding='utf-8') as f:
+        state = json.load(f)
+    return state["updated_at"], seed.key_from_json(state["user_id"])
+
+
+def save_checkpoint(path, updated_at, user_id):
+    """Persists the high-water mark atomically."""
+    tmp = f"{path}.tmp"
+    with open(tmp, 'w', encoding='utf-8') as f:
+        json.dump({"updated_at": updated_at, "user_id": seed.key_to_json(user_id)}, f)
+    os.replace(tmp, path)
+
+
+def stream_changes(checkpoint_path, batch_size=1000, safety_lag=1.0):
+    """
+    Generator that yields batches of user_data rows inserted or updated since
+    the mark saved in checkpoint_path, in (updated_at, user_id) order.
+    The mark advances past a batch once the consumer asks for the next one,
+    so a crash re-delivers at most one batch. Rows changed in the last
+    safety_lag seconds are left for the next run, giving in-flight
+    transactions time to commit. Deleted rows are not reported.
+    """
+    mark = load_checkpoint(checkpoint_path)
+    query = (
+        f"SELECT {seed.USER_COLUMNS}, updated_at FROM user_data "
+        "WHERE updated_at < NOW(6) - INTERVAL %s MICROSECOND"
+    )
+    params = (int(safety_lag * 1e6),)
+    if mark is not None:
+        query += " AND (updated_at > %s OR (updated_at = %s AND user_id > %s))"
+        params += (mark[0], mark[0], mark[1])
+    query += " ORDER BY updated_at, user_id"
+
+    for batch in seed.stream_batches(query, params, batch_size):
+        yield [row[:-1] for row in batch]
+        last = batch[-1]
+        save_checkpoint(checkpoint_path, last[-1].isoformat(sep=" "), last[0])
+
+
+def stream_changed_users(checkpoint_path, batch_size=1000):
+    """Generator that yields changed user_data rows one at a time."""
+    for batch in stream_changes(checkpoint_path, batch_size):
+        yield from batch
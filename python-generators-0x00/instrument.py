@@ -0,0 +1,241 @@
+"""
+Query instrumentation for seed and the generator modules.
+
+    instrument = __import__('instrument')
+    instrument.enable(slow_threshold=0.5)
+    ...
+    instrument.report(top=10)
+
+Once enabled, every cursor opened on a pooled connection records query
+text, duration, rows returned and approximate bytes transferred; wrap raw
+connections passed to seed functions with InstrumentedConnection. Duration
+is the time spent inside execute and fetch calls, so a streaming consumer's
+own work between fetches is not counted; wall time from execute to the end
+of the result is kept separately. Queries whose duration exceeds
+slow_threshold get an EXPLAIN captured alongside them.
+"""
+import atexit
+import threading
+import time
+from collections import deque
+
+seed = __import__('seed')
+
+
+class QueryStats:
+    """Thread-safe per-query totals plus the most recent slow queries."""
+
+    def __init__(self, slow_threshold=0.5, keep_slow=50):
+        self.slow_threshold = slow_threshold
+        self.queries = {}
+        self.slow = deque(maxlen=keep_slow)
+        self._lock = threading.Lock()
+
+    def record(self, query, seconds, rows, nbytes, plan=None, wall_seconds=None):
+        with self._lock:
+            totals = self.queries.setdefault(query, {
+                "calls": 0, "seconds": 0.0, "max_seconds": 0.0,
+                "wall_seconds": 0.0, "rows": 0, "bytes": 0,
+            })
+            totals["calls"] += 1
+            totals["seconds"] += seconds
+            totals["wall_seconds"] += seconds if wall_seconds is None else wall_seconds
+            totals["max_seconds"] = max(totals["max_seconds"], seconds)
+            totals["rows"] += rows
+            totals["bytes"] += nbytes
+            if seconds >= self.slow_threshold:
+                self.slow.append({
+                    "query": query, "seconds": seconds,
+                    "wall_seconds": wall_seconds, "rows": rows, "plan": plan,
+                })
+
+    def top(self, n=10):
+        """The n queries with the highest total time, slowest first."""
+        with self._lock:
+            ranked = sorted(
+                self.queries.items(), key=lambda item: item[1]["seconds"], reverse=True
+            )
+            return [dict(totals, query=query) for query, totals in ranked[:n]]
+
+    def reset(self):
+        with self._lock:
+            self.queries.clear()
+            self.slow.clear()
+
+
+def _value_bytes(value):
+    if isinstance(value, (str, bytes, bytearray)):
+        return len(value)
+    return 8
+
+
+class InstrumentedCursor:
+    """
+    Wraps a DB-API cursor and times each statement while it runs inside
+    execute() and the fetch calls, until its result is exhausted, the next
+    statement runs, or the cursor is closed.
+    """
+
+    def __init__(self, cursor, connection, stats):
+        self._cursor = cursor
+        self._connection = connection
+        self._stats = stats
+        self._pending = None
+
+    def __getattr__(self, name):
+        return getattr(self._cursor, name)
+
+    def _start(self, query, params):
+        self._finish()
+        # query, params, busy seconds, rows, bytes, wall-clock start
+        self._pending = [query, params, 0.0, 0, 0, time.perf_counter()]
+
+    def _busy(self, start):
+        if self._pending is not None:
+            self._pending[2] += time.perf_counter() - start
+
+    def _count(self, rows):
+        if self._pending is not None:
+            self._pending[3] += len(rows)
+            self._pending[4] += sum(_value_bytes(v) for row in rows for v in row)
+
+    def _finish(self):
+        if self._pending is None:
+            return
+        query, params, seconds, rows, nbytes, started = self._pending
+        self._pending = None
+        wall_seconds = time.perf_counter() - started
+        plan = None
+        if seconds >= self._stats.slow_threshold:
+            plan = self._explain(query, params)
+        self._stats.record(query, seconds, rows, nbytes, plan, wall_seconds)
+
+    def _explain(self, query, params):
+        """EXPLAIN output for a slow SELECT, if the connection is free."""
+        if not query.lstrip().upper().startswith("SELECT"):
+            return None
+        if getattr(self._connection, "unread_result", False):
+            return None
+        cursor = self._connection.cursor()
+        try:
+            cursor.execute("EXPLAIN " + query, params or ())
+            columns = cursor.column_names
+            return [dict(zip(columns, row)) for row in cursor.fetchall()]
+        except Exception:
+            return None
+        finally:
+            cursor.close()
+
+    def execute(self, query, params=None, *args, **kwargs):
+        self._start(query, params)
+        start = time.perf_counter()
+        try:
+            return self._cursor.execute(query, params or (), *args, **kwargs)
+        finally:
+            self._busy(start)
+
+    def executemany(self, query, seq_params, *args, **kwargs):
+        self._start(query, None)
+        start = time.perf_counter()
+        try:
+            result = self._cursor.executemany(query, seq_params, *args, **kwargs)
+        finally:
+            self._busy(start)
+        self._pending[3] = max(self._cursor.rowcount, 0)
+        self._finish()
+        return result
+
+    def fetchone(self):
+        start = time.perf_counter()
+        row = self._cursor.fetchone()
+        self._busy(start)
+        if row is None:
+            self._finish()
+        else:
+            self._count([row])
+        return row
+
+    def fetchmany(self, size=None):
+        start = time.perf_counter()
+        rows = self._cursor.fetchmany(size) if size is not None else self._cursor.fetchmany()
+        self._busy(start)
+        if rows:
+            self._count(rows)
+        else:
+            self._finish()
+        return rows
+
+    def fetchall(self):
+        start = time.perf_counter()
+        rows = self._cursor.fetchall()
+        self._busy(start)
+        self._count(rows)
+        self._finish()
+        return rows
+
+    def __iter__(self):
+        rows = iter(self._cursor)
+        while True:
+            start = time.perf_counter()
+            row = next(rows, None)
+            self._busy(start)
+            if row is None:
+                break
+            self._count([row])
+            yield row
+        self._finish()
+
+    def close(self):
+        self._finish()
+        return self._cursor.close()
+
+
+class InstrumentedConnection:
+    """Wraps a raw connection, e.g. from connect_to_prodev, to record its cursors."""
+
+    def __init__(self, connection, query_stats=None):
+        self._connection = connection
+        self._stats = query_stats or stats
+
+    def __getattr__(self, name):
+        return getattr(self._connection, name)
+
+    def cursor(self, *args, **kwargs):
+        return InstrumentedCursor(
+            self._connection.cursor(*args, **kwargs), self._connection, self._stats
+        )
+
+
+stats = QueryStats()
+
+
+def enable(slow_threshold=0.5, report_at_exit=True, top=10):
+    """Starts recording every pooled cursor; optionally reports at exit."""
+    stats.slow_threshold = slow_threshold
+    seed.cursor_wrapper = lambda cursor, connection: InstrumentedCursor(
+        cursor, connection, stats
+    )
+    # enable() may run more than once; report only once at exit
+    atexit.unregister(report)
+    if report_at_exit:
+        atexit.register(report, top)
+
+
+def disable():
+    """Stops recording; collected numbers are kept until reset()."""
+    seed.cursor_wrapper = None
+    atexit.unregister(report)
+
+
+def report(top=10):
+    """Prints the top queries by total time and the captured slow queries."""
+    print(f"Top {top} queries by total time:")
+    for entry in stats.top(top):
+        print(f"  {entry['seconds']:.3f}s total ({entry['wall_seconds']:.3f}s wall), "
+              f"{entry['calls']} calls, "
+              f"max {entry['max_seconds']:.3f}s, {entry['rows']} rows, "
+              f"{entry['bytes']} bytes: {entry['query'].strip()}")
+    for entry in stats.slow:
+        print(f"Slow ({entry['seconds']:.3f}s): {entry['query'].strip()}")
+        for step in entry["plan"] or ():
+            print(f"    {step}")
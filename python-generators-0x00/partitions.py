@@ -0,0 +1,213 @@
+import functools
+import heapq
+import queue
+import threading
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+seed = __import__('seed')
+pushdown = __import__('pushdown')
+
+_DONE = object()
+
+
+def prefix_ranges(n, binary=None):
+    """
+    Splits the user_id key space into n (low, high) ranges on the leading
+    byte of the UUID (two hex digits for CHAR(36) ids). None means
+    unbounded. binary defaults to what the live table uses.
+    """
+    if binary is None:
+        binary = seed.get_schema()["binary_ids"]
+    bounds = [(256 * i) // n for i in range(1, n)]
+    bounds = [bytes([b]) if binary else f"{b:02x}" for b in bounds]
+    lows = [None] + bounds
+    highs = bounds + [None]
+    return list(zip(lows, highs))
+
+
+def sampled_ranges(n, sample_size=1000):
+    """Splits user_data into n ranges using boundaries from a random sample of keys."""
+    connection = seed.get_connection()
+    cursor = connection.cursor()
+    try:
+        cursor.execute("SELECT COUNT(*) FROM user_data")
+        (total,) = cursor.fetchone()
+        fraction = min(1.0, sample_size / total) if total else 1.0
+        cursor.execute(
+            "SELECT user_id FROM user_data WHERE RAND() < %s ORDER BY user_id",
+            (fraction,),
+        )
+        keys = [key for (key,) in cursor.fetchall()]
+    finally:
+        cursor.close()
+        connection.close()
+
+    if len(keys) < n:
+        return prefix_ranges(n)
+    bounds = [keys[(len(keys) * i) // n] for i in range(1, n)]
+    return list(zip([None] + bounds, bounds + [None]))
+
+
+def _range_query(low, high, predicates=(), ordered=False):
+    """Builds the SELECT for one key range plus any pushed-down predicates."""
+    where, params = pushdown.compile_where(predicates)
+    conditions, bound = [], []
+    if low is not None:
+        conditions.append("user_id >= %s")
+        bound.append(low)
+    if high is not None:
+        conditions.append("user_id < %s")
+        bound.append(high)
+    if conditions:
+        where = (where + " AND " if where else " WHERE ") + " AND ".join(conditions)
+    query = f"SELECT {seed.USER_COLUMNS} FROM user_data{where}"
+    if ordered:
+        query += " ORDER BY user_id"
+    return query, tuple(params) + tuple(bound)
+
+
+def scan_partition(low, high, batch_size=500, predicates=(), ordered=False):
+    """Generator that yields batches of rows whose user_id falls in [low, high)."""
+    query, params = _range_query(low, high, predicates, ordered)
+    yield from seed.stream_batches(query, params, batch_size)
+
+
+def _put(out, item, stop):
+    """Puts item on a bounded queue unless the consumer has gone away."""
+    while not stop.is_set():
+        try:
+            out.put(item, timeout=0.1)
+            return True
+        except queue.Full:
+            continue
+    return False
+
+
+def _produce(work, queues, stop):
+    """Worker thread body: drains its batch sources into their queues."""
+    for index, factory in work:
+        out = queues[index]
+        batches = iter(factory())
+        try:
+            for batch in batches:
+                if not _put(out, batch, stop):
+                    return
+        except Exception as err:
+            _put(out, err, stop)
+            return
+        finally:
+            if hasattr(batches, "close"):
+                batches.close()
+        if not _put(out, _DONE, stop):
+            return
+
+
+def _drain(out):
+    """Yields rows from one source's queue until its end marker."""
+    for batch in iter(out.get, _DONE):
+        if isinstance(batch, Exception):
+            raise batch
+        yield from batch
+
+
+def _start(work, queues, stop):
+    thread = threading.Thread(target=_produce, args=(work, queues, stop), daemon=True)
+    thread.start()
+    return thread
+
+
+def merge_batches(factories, ordered=False, key=None, workers=None, max_pending=4,
+                  window=2):
+    """
+    Generator that runs every factory() batch generator on a thread pool and
+    yields the merged rows. By default rows come out as batches arrive.
+    With ordered=True each source is drained in turn (for disjoint, sorted
+    sources) and only `window` sources are open at a time: the one being
+    drained and the next ones reading ahead, so later sources do not sit
+    on an unread result (and hit net_write_timeout) until their turn.
+    With a key function the sources are k-way merged by key.
+    """
+    stop = threading.Event()
+    threads = []
+    try:
+        if key is not None:
+            # Every source must progress independently for the k-way merge
+            queues = [queue.Queue(max_pending) for _ in factories]
+            threads = [
+                _start([(i, factory)], queues, stop)
+                for i, factory in enumerate(factories)
+            ]
+            yield from heapq.merge(*(_drain(out) for out in queues), key=key)
+        elif ordered:
+            window = max(1, min(window, workers or window))
+            queues = {}
+            for i in range(len(factories)):
+                for j in range(len(queues), min(len(factories), i + window)):
+                    queues[j] = queue.Queue(max_pending)
+                    threads.append(_start([(j, factories[j])], queues, stop))
+                yield from _drain(queues[i])
+        else:
+            workers = min(workers or len(factories), len(factories))
+            shared = queue.Queue(max_pending * workers)
+            queues = [shared] * len(factories)
+            numbered = list(enumerate(factories))
+            threads = [
+                _start(numbered[i::workers], queues, stop) for i in range(workers)
+            ]
+            remaining = len(factories)
+            while remaining:
+                batch = shared.get()
+                if batch is _DONE:
+                    remaining -= 1
+                    continue
+                if isinstance(batch, Exception):
+                    raise batch
+                yield from batch
+    finally:
+        stop.set()
+        for thread in threads:
+            thread.join()
+
+
+def parallel_scan(partitions=4, batch_size=500, predicates=(), ordered=False,
+                  workers=None, ranges=None, max_pending=4):
+    """
+    Generator that reads user_data as `partitions` key ranges on concurrent
+    connections and yields the merged rows. With ordered=True rows come out
+    in user_id order; otherwise in whatever order batches arrive.
+    """
+    ranges = ranges or prefix_ranges(partitions)
+    factories = [
+        functools.partial(scan_partition, low, high, batch_size, predicates, ordered)
+        for low, high in ranges
+    ]
+    # Each worker holds a pooled connection; more than the pool allows
+    # would only wait for one and time out
+    workers = min(workers or len(factories), seed.get_pool().max_size)
+    # Ranges are disjoint and sorted, so draining them in turn is a merge
+    yield from merge_batches(factories, ordered, None, workers, max_pending)
+
+
+def _map_range(func, low, high, batch_size, predicates):
+    """Process pool task: applies func to every batch of one range."""
+    return [
+        func(batch)
+        for batch in scan_partition(low, high, batch_size, predicates)
+    ]
+
+
+def map_partitions(func, partitions=4, batch_size=500, predicates=(),
+                   processes=None, ranges=None):
+    """
+    Runs func(batch) over every batch of user_data across a process pool,
+    one key range per task, and yields the results as ranges finish.
+    func must be a picklable top-level function.
+    """
+    ranges = ranges or prefix_ranges(partitions)
+    with ProcessPoolExecutor(max_workers=processes) as pool:
+        futures = [
+            pool.submit(_map_range, func, low, high, batch_size, predicates)
+            for low, high in ranges
+        ]
+        for future in as_completed(futures):
+            yield from future.result()
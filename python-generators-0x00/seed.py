@@ -1,6 +1,12 @@
 import mysql.connector
 import uuid
 import csv
+import json
+import os
+import sys
+import threading
+import time
+from itertools import islice
 
 def connect_db():
     """Connects to MySQL server (without database)."""
@@ -24,39 +30,503 @@ def create_database(connection):
     finally:
         cursor.close()
 
+# Connection settings for ALX_prodev, shared by the sync and async readers
+PRODEV_CONFIG = {
+    "host": "localhost",
+    "user": "your_username",
+    "password": "your_password",
+    "database": "ALX_prodev",
+}
+
 def connect_to_prodev():
     """Connects to ALX_prodev database."""
     try:
-        conn = mysql.connector.connect(
-            host="localhost",
-            user="your_username",
-            password="your_password",
-            database="ALX_prodev"
-        )
+        conn = mysql.connector.connect(**PRODEV_CONFIG)
         return conn
     except mysql.connector.Error as err:
         print(f"Error connecting to ALX_prodev: {err}")
         return None
 
-def create_table(connection):
-    """Creates user_data table if it doesn't exist."""
-    cursor = connection.cursor()
-    create_table_query = """
+class PoolTimeoutError(Exception):
+    """Raised when no pooled connection frees up within the checkout timeout."""
+
+
+# Optional callable(cursor, connection) -> cursor applied to pooled cursors,
+# e.g. instrument.enable() installs query timing here
+cursor_wrapper = None
+
+
+class PooledConnection:
+    """
+    A borrowed connection. Behaves like the underlying MySQL connection, but
+    close() hands it back to the pool instead of disconnecting. Each
+    checkout gets its own handle, so closing one twice is harmless.
+    """
+
+    def __init__(self, pool, connection, created_at):
+        self._pool = pool
+        self._connection = connection
+        self.created_at = created_at
+
+    def __getattr__(self, name):
+        return getattr(self._connection, name)
+
+    def cursor(self, *args, **kwargs):
+        """Opens a cursor, wrapped by cursor_wrapper when one is installed."""
+        cursor = self._connection.cursor(*args, **kwargs)
+        if cursor_wrapper is not None:
+            return cursor_wrapper(cursor, self._connection)
+        return cursor
+
+    def close(self):
+        """Returns the connection to its pool."""
+        pool, self._pool = self._pool, None
+        if pool is not None:
+            pool.release(self._connection, self.created_at)
+
+    def shutdown(self):
+        """Drops the connection without returning it, e.g. mid-result."""
+        pool, self._pool = self._pool, None
+        if pool is not None:
+            pool.discard(self._connection)
+
+
+class ConnectionPool:
+    """
+    Thread-safe pool of MySQL connections with min/max size, a health check
+    on checkout, a maximum connection lifetime and checkout wait metrics.
+    Connecting, pinging and closing happen outside the pool lock.
+    """
+
+    def __init__(self, factory, min_size=1, max_size=10, max_lifetime=3600,
+                 timeout=30):
+        self.factory = factory
+        self.min_size = min_size
+        self.max_size = max_size
+        self.max_lifetime = max_lifetime
+        self.timeout = timeout
+        # (connection, created_at) pairs, most recently returned last
+        self._idle = []
+        self._size = 0
+        self._lock = threading.Condition()
+        self.metrics = {
+            "checkouts": 0,
+            "created": 0,
+            "discarded": 0,
+            "waits": 0,
+            "timeouts": 0,
+            "wait_seconds": 0.0,
+            "max_wait_seconds": 0.0,
+        }
+        for _ in range(min_size):
+            self._idle.append((self._create(), time.monotonic()))
+            self._size += 1
+            self.metrics["created"] += 1
+
+    def _create(self):
+        connection = self.factory()
+        if connection is None:
+            raise mysql.connector.Error("Could not open a pooled connection")
+        return connection
+
+    def _expired(self, created_at):
+        return time.monotonic() - created_at > self.max_lifetime
+
+    def _healthy(self, connection):
+        try:
+            return connection.is_connected()
+        except mysql.connector.Error:
+            return False
+
+    def _checkout(self, start):
+        """
+        Under the lock: pops an idle (connection, created_at), or reserves a
+        slot for a new connection and returns None, waiting if neither is
+        possible. Returns whether the caller had to wait.
+        """
+        waited = False
+        while True:
+            if self._idle:
+                return self._idle.pop(), waited
+            if self._size < self.max_size:
+                self._size += 1
+                return None, waited
+            remaining = self.timeout - (time.monotonic() - start)
+            if remaining <= 0:
+                self.metrics["timeouts"] += 1
+                raise PoolTimeoutError(
+                    f"No connection available after {self.timeout}s"
+                )
+            waited = True
+            self._lock.wait(remaining)
+
+    def acquire(self):
+        """Checks out a healthy connection, waiting up to timeout seconds."""
+        start = time.monotonic()
+        waited = False
+        while True:
+            with self._lock:
+                entry, waited_now = self._checkout(start)
+            waited = waited or waited_now
+            if entry is None:
+                try:
+                    connection = self._create()
+                except Exception:
+                    with self._lock:
+                        self._size -= 1
+                        self._lock.notify()
+                    raise
+                created_at = time.monotonic()
+                break
+            connection, created_at = entry
+            if not self._expired(created_at) and self._healthy(connection):
+                break
+            self._drop(connection)
+
+        elapsed = time.monotonic() - start
+        with self._lock:
+            self.metrics["created"] += entry is None
+            self.metrics["checkouts"] += 1
+            if waited:
+                self.metrics["waits"] += 1
+            self.metrics["wait_seconds"] += elapsed
+            self.metrics["max_wait_seconds"] = max(
+                self.metrics["max_wait_seconds"], elapsed
+            )
+        return PooledConnection(self, connection, created_at)
+
+    def release(self, connection, created_at):
+        """
+        Returns a connection. Any open transaction is rolled back first so
+        the next borrower does not read through a stale REPEATABLE READ
+        snapshot; broken, expired or mid-result connections are dropped.
+        """
+        reusable = not connection.unread_result and not self._expired(created_at)
+        if reusable:
+            try:
+                if getattr(connection, "in_transaction", True):
+                    connection.rollback()
+            except mysql.connector.Error:
+                reusable = False
+        if not reusable:
+            self._drop(connection)
+            return
+        with self._lock:
+            self._idle.append((connection, created_at))
+            self._lock.notify()
+
+    def discard(self, connection):
+        """Removes a connection from the pool, closing its socket."""
+        self._drop(connection, hard=True)
+
+    def _drop(self, connection, hard=False):
+        with self._lock:
+            self._size -= 1
+            self.metrics["discarded"] += 1
+            self._lock.notify()
+        try:
+            if hard:
+                connection.shutdown()
+            else:
+                connection.close()
+        except mysql.connector.Error:
+            pass
+
+    def close_all(self):
+        """Closes every idle connection."""
+        with self._lock:
+            idle, self._idle = self._idle, []
+        for connection, _ in idle:
+            self._drop(connection)
+
+    def stats(self):
+        """Current size, idle count and checkout metrics."""
+        with self._lock:
+            return dict(self.metrics, size=self._size, idle=len(self._idle))
+
+
+_pool = None
+_pool_pid = None
+_pool_settings = {}
+_pool_lock = threading.Lock()
+
+
+def configure_pool(**settings):
+    """
+    Sets the options (min_size, max_size, max_lifetime, timeout) used for
+    the process-wide pool and rebuilds it on next use.
+    """
+    global _pool
+    with _pool_lock:
+        _pool_settings.update(settings)
+        if _pool is not None:
+            _pool.close_all()
+        _pool = None
+
+
+def get_pool():
+    """Returns the process-wide pool of ALX_prodev connections."""
+    global _pool, _pool_pid
+    with _pool_lock:
+        # A forked child must not share its parent's sockets
+        if _pool is None or _pool_pid != os.getpid():
+            _pool = ConnectionPool(connect_to_prodev, **_pool_settings)
+            _pool_pid = os.getpid()
+        return _pool
+
+
+def get_connection():
+    """Borrows an ALX_prodev connection from the pool; close() returns it."""
+    return get_pool().acquire()
+
+
+_schema = None
+
+def get_schema():
+    """table_schema() of ALX_prodev.user_data, looked up once per process."""
+    global _schema
+    if _schema is None:
+        connection = get_connection()
+        try:
+            _schema = table_schema(connection)
+        finally:
+            connection.close()
+    return _schema
+
+
+# Columns the readers select; bookkeeping columns like updated_at are left out
+USER_COLUMNS = "user_id, name, email, age"
+
+SCHEMA_PROFILES = {
+    # CHAR(36) ids, as the project started with
+    "default": """
     CREATE TABLE IF NOT EXISTS user_data (
         user_id CHAR(36) PRIMARY KEY,
         name VARCHAR(100) NOT NULL,
         email VARCHAR(100) NOT NULL,
         age DECIMAL(5,2) NOT NULL,
-        INDEX(user_id)
+        updated_at TIMESTAMP(6) NOT NULL
+            DEFAULT CURRENT_TIMESTAMP(6) ON UPDATE CURRENT_TIMESTAMP(6),
+        created_at TIMESTAMP(6) NOT NULL DEFAULT CURRENT_TIMESTAMP(6),
+        INDEX idx_updated_at (updated_at, user_id),
+        INDEX idx_created_at (created_at, user_id)
     );
+    """,
+    # 16-byte ids, unique emails and a covering (age, user_id) index
+    "performance": """
+    CREATE TABLE IF NOT EXISTS user_data (
+        user_id BINARY(16) PRIMARY KEY,
+        name VARCHAR(100) NOT NULL,
+        email VARCHAR(100) NOT NULL,
+        age DECIMAL(5,2) NOT NULL,
+        updated_at TIMESTAMP(6) NOT NULL
+            DEFAULT CURRENT_TIMESTAMP(6) ON UPDATE CURRENT_TIMESTAMP(6),
+        created_at TIMESTAMP(6) NOT NULL DEFAULT CURRENT_TIMESTAMP(6),
+        UNIQUE INDEX idx_email (email),
+        INDEX idx_age (age, user_id),
+        INDEX idx_updated_at (updated_at, user_id),
+        INDEX idx_created_at (created_at, user_id)
+    );
+    """,
+}
+
+def create_table(connection, profile="default"):
+    """
+    Creates user_data table if it doesn't exist, using one of
+    SCHEMA_PROFILES. In the performance profile user_id is stored and
+    returned as 16 raw bytes.
     """
-    cursor.execute(create_table_query)
+    global _schema
+    if profile not in SCHEMA_PROFILES:
+        raise ValueError(f"Unknown schema profile {profile!r}")
+    _schema = None
+    cursor = connection.cursor()
+    cursor.execute(SCHEMA_PROFILES[profile])
     connection.commit()
     print("Table user_data created or already exists.")
     cursor.close()
+    add_updated_at(connection)
+    add_created_at(connection)
+
+def table_schema(connection):
+    """
+    Reports how the existing user_data table is laid out:
+    {"binary_ids": bool, "unique_email": bool, "indexes": set of names}.
+    """
+    cursor = connection.cursor()
+    try:
+        cursor.execute(
+            "SELECT data_type FROM information_schema.columns "
+            "WHERE table_schema = DATABASE() AND table_name = 'user_data' "
+            "AND column_name = 'user_id'"
+        )
+        row = cursor.fetchone()
+        cursor.execute(
+            "SELECT index_name, non_unique, column_name "
+            "FROM information_schema.statistics "
+            "WHERE table_schema = DATABASE() AND table_name = 'user_data' "
+            "AND seq_in_index = 1"
+        )
+        indexes = cursor.fetchall()
+    finally:
+        cursor.close()
+    return {
+        "binary_ids": bool(row) and row[0].lower() in ("binary", "varbinary"),
+        "unique_email": any(
+            not non_unique and column == "email" for _, non_unique, column in indexes
+        ),
+        "indexes": {name for name, _, _ in indexes},
+    }
+
+def new_user_id(binary=False):
+    """A fresh UUID4 user_id, as 16 bytes for the performance profile."""
+    value = uuid.uuid4()
+    return value.bytes if binary else str(value)
+
+def key_to_json(value):
+    """Makes a key value (possibly binary) safe to store in JSON."""
+    if isinstance(value, (bytes, bytearray)):
+        return {"hex": bytes(value).hex()}
+    return value
+
+def key_from_json(value):
+    """Reverses key_to_json."""
+    if isinstance(value, dict):
+        return bytes.fromhex(value["hex"])
+    return value
+
+def migrate_to_performance_schema(connection, batch_size=10000):
+    """
+    Converts an existing default-profile user_data table to the
+    performance profile in place: user_id is copied to a BINARY(16) column
+    in committed batches, then the keys and indexes are swapped in one
+    ALTER. A baseline table first gets updated_at and created_at
+    (add_updated_at, add_created_at), which the new indexes cover. Fails
+    before any DDL change to keys if emails are not unique. Needs MySQL 8
+    for UUID_TO_BIN.
+    """
+    global _schema
+    _schema = None
+    add_updated_at(connection)
+    add_created_at(connection)
+    schema = table_schema(connection)
+    cursor = connection.cursor()
+    try:
+        cursor.execute(
+            "SELECT email FROM user_data GROUP BY email HAVING COUNT(*) > 1 LIMIT 1"
+        )
+        duplicate = cursor.fetchone()
+        if duplicate and not schema["unique_email"]:
+            raise ValueError(
+                f"Cannot add unique email index: {duplicate[0]} appears more than once"
+            )
+
+        alterations = []
+        if not schema["binary_ids"]:
+            cursor.execute(
+                "SELECT COUNT(*) FROM information_schema.columns "
+                "WHERE table_schema = DATABASE() AND table_name = 'user_data' "
+                "AND column_name = 'user_id_bin'"
+            )
+            (has_bin,) = cursor.fetchone()
+            if not has_bin:
+                cursor.execute("ALTER TABLE user_data ADD COLUMN user_id_bin BINARY(16) NULL")
+
+            # Walk the primary key in batch_size ranges, so each batch seeks
+            # straight to its rows instead of rescanning converted ones
+            converted = 0
+            last = ""
+            while True:
+                cursor.execute(
+                    "SELECT user_id FROM user_data WHERE user_id > %s "
+                    "ORDER BY user_id LIMIT 1 OFFSET %s",
+                    (last, batch_size - 1),
+                )
+                row = cursor.fetchone()
+                bound = "user_id > %s AND user_id <= %s" if row else "user_id > %s"
+                # updated_at = updated_at keeps the copy from looking like a change
+                cursor.execute(
+                    "UPDATE user_data SET user_id_bin = UUID_TO_BIN(user_id), "
+                    f"updated_at = updated_at WHERE {bound} AND user_id_bin IS NULL",
+                    (last, row[0]) if row else (last,),
+                )
+                connection.commit()
+                converted += cursor.rowcount
+                print(f"Converted {converted} user_ids to binary")
+                if not row:
+                    break
+                last = row[0]
+
+            alterations += ["DROP PRIMARY KEY"]
+            # The old redundant INDEX(user_id) was auto-named user_id
+            alterations += [
+                f"DROP INDEX {name}" for name in (
+                    "user_id", "idx_updated_at", "idx_created_at", "idx_age"
+                )
+                if name in schema["indexes"]
+            ]
+            alterations += [
+                "DROP COLUMN user_id",
+                "CHANGE user_id_bin user_id BINARY(16) NOT NULL",
+                "ADD PRIMARY KEY (user_id)",
+                "ADD INDEX idx_updated_at (updated_at, user_id)",
+                "ADD INDEX idx_created_at (created_at, user_id)",
+                "ADD INDEX idx_age (age, user_id)",
+            ]
+        elif "idx_age" not in schema["indexes"]:
+            alterations.append("ADD INDEX idx_age (age, user_id)")
+
+        if not schema["unique_email"]:
+            alterations.append("ADD UNIQUE INDEX idx_email (email)")
+
+        if alterations:
+            cursor.execute("ALTER TABLE user_data " + ", ".join(alterations))
+            connection.commit()
+        print("user_data uses the performance schema profile.")
+    finally:
+        cursor.close()
+
+def _add_column(connection, column, definition):
+    """Adds an indexed (column, user_id) bookkeeping column if it is missing."""
+    cursor = connection.cursor()
+    try:
+        cursor.execute(
+            "SELECT COUNT(*) FROM information_schema.columns "
+            "WHERE table_schema = DATABASE() AND table_name = 'user_data' "
+            f"AND column_name = '{column}'"
+        )
+        (exists,) = cursor.fetchone()
+        if exists:
+            return
+        cursor.execute(
+            f"ALTER TABLE user_data ADD COLUMN {column} {definition}, "
+            f"ADD INDEX idx_{column} ({column}, user_id)"
+        )
+        connection.commit()
+        print(f"Added {column} column to user_data.")
+    finally:
+        cursor.close()
+
+def add_updated_at(connection):
+    """Adds the indexed updated_at change-tracking column to an older table."""
+    _add_column(
+        connection, "updated_at",
+        "TIMESTAMP(6) NOT NULL "
+        "DEFAULT CURRENT_TIMESTAMP(6) ON UPDATE CURRENT_TIMESTAMP(6)",
+    )
+
+def add_created_at(connection):
+    """
+    Adds the indexed created_at insertion-time column to an older table.
+    Rows already there all get the time of the ALTER.
+    """
+    _add_column(
+        connection, "created_at", "TIMESTAMP(6) NOT NULL DEFAULT CURRENT_TIMESTAMP(6)"
+    )
 
 def insert_data(connection, csv_file):
     """Inserts users from CSV if not already in the database (by email)."""
+    binary_ids = table_schema(connection)["binary_ids"]
     cursor = connection.cursor()
 
     with open(csv_file, newline='', encoding='utf-8') as f:
@@ -73,7 +543,7 @@ def insert_data(connection, csv_file):
                 continue
 
             # Insert new user
-            user_id = str(uuid.uuid4())
+            user_id = new_user_id(binary_ids)
             insert_query = """
                 INSERT INTO user_data (user_id, name, email, age)
                 VALUES (%s, %s, %s, %s)
@@ -83,3 +553,271 @@ def insert_data(connection, csv_file):
 
     connection.commit()
     cursor.close()
+
+
+def _read_chunks(csv_file, chunk_size):
+    """Yields lists of (name, email, age) tuples read lazily from the CSV."""
+    with open(csv_file, newline='', encoding='utf-8') as f:
+        reader = csv.DictReader(f)
+        rows = ((row['name'], row['email'], row['age']) for row in reader)
+        while True:
+            chunk = list(islice(rows, chunk_size))
+            if not chunk:
+                break
+            yield chunk
+
+
+def _insert_chunk(cursor, chunk, schema=None):
+    """
+    Inserts one chunk of (name, email, age) rows, skipping emails that are
+    already in the table or repeated inside the chunk.
+    schema is the table_schema() result; with a unique email index the
+    lookup is skipped and INSERT IGNORE does the deduplication.
+    Returns (inserted, skipped).
+    """
+    if not chunk:
+        return 0, 0
+    schema = schema or {"binary_ids": False, "unique_email": False}
+    seen = set()
+    unique = []
+    for name, email, age in chunk:
+        if email in seen:
+            continue
+        seen.add(email)
+        unique.append((name, email, age))
+
+    if schema["unique_email"]:
+        values = [
+            (new_user_id(schema["binary_ids"]), name, email, age)
+            for name, email, age in unique
+        ]
+        cursor.executemany(
+            "INSERT IGNORE INTO user_data (user_id, name, email, age) "
+            "VALUES (%s, %s, %s, %s)",
+            values,
+        )
+        inserted = max(cursor.rowcount, 0)
+        return inserted, len(chunk) - inserted
+
+    # One set-based lookup for the whole chunk instead of one per row
+    placeholders = ", ".join(["%s"] * len(seen))
+    cursor.execute(
+        f"SELECT email FROM user_data WHERE email IN ({placeholders})",
+        tuple(seen),
+    )
+    existing = {email for (email,) in cursor.fetchall()}
+
+    values = [
+        (new_user_id(schema["binary_ids"]), name, email, age)
+        for name, email, age in unique
+        if email not in existing
+    ]
+    if values:
+        cursor.executemany(
+            "INSERT INTO user_data (user_id, name, email, age) "
+            "VALUES (%s, %s, %s, %s)",
+            values,
+        )
+    return len(values), len(chunk) - len(values)
+
+
+def insert_data_bulk(connection, csv_file, chunk_size=1000, commit_every=10000):
+    """
+    Bulk version of insert_data for large CSV files.
+    Streams the CSV in chunks of chunk_size rows, deduplicates each chunk by
+    email with a single query, inserts it with executemany and commits every
+    commit_every inserted rows. Prints a summary at the end.
+    """
+    schema = table_schema(connection)
+    cursor = connection.cursor()
+    inserted = skipped = pending = 0
+    start = time.perf_counter()
+
+    try:
+        for chunk in _read_chunks(csv_file, chunk_size):
+            added, dropped = _insert_chunk(cursor, chunk, schema)
+            inserted += added
+            skipped += dropped
+            pending += added
+            if pending >= commit_every:
+                connection.commit()
+                pending = 0
+        connection.commit()
+    finally:
+        cursor.close()
+
+    elapsed = time.perf_counter() - start
+    rate = (inserted + skipped) / elapsed if elapsed else 0.0
+    print(f"Inserted {inserted} rows, skipped {skipped} duplicates "
+          f"in {elapsed:.2f}s ({rate:.0f} rows/sec)")
+    return inserted, skipped
+
+
+def _row_size(row):
+    """Rough in-memory size of one fetched row, in bytes."""
+    return sys.getsizeof(row) + sum(sys.getsizeof(value) for value in row)
+
+
+# Rows fetched first, and sampled from each batch, to estimate row size
+_PROBE_ROWS = 10
+
+
+def _fit_window(rows, batch_size, memory_limit):
+    """Largest batch of rows like these that stays under memory_limit."""
+    per_row = max(_row_size(row) for row in rows[:_PROBE_ROWS])
+    return max(1, min(batch_size, memory_limit // per_row))
+
+
+def stream_batches(query, params=None, batch_size=500, memory_limit=None,
+                   pool=None):
+    """
+    Generator that runs query on an unbuffered cursor and yields lists of at
+    most batch_size rows. Only one batch is held on the client at a time; if
+    memory_limit (bytes) is set the batch is shrunk to fit under it, sized
+    from a few probe rows before the first batch and then from each batch.
+    Abandoning the generator early drops the connection instead of reading
+    the rest of the result. pool defaults to the process-wide pool.
+    """
+    connection = (pool or get_pool()).acquire()
+    cursor = connection.cursor(buffered=False)
+    window = batch_size
+    try:
+        cursor.execute(query, params or ())
+        pending = []
+        if memory_limit is not None:
+            pending = cursor.fetchmany(min(batch_size, _PROBE_ROWS))
+            if pending:
+                window = _fit_window(pending, batch_size, memory_limit)
+        while True:
+            if len(pending) < window:
+                pending += cursor.fetchmany(window - len(pending))
+            batch, pending = pending[:window], pending[window:]
+            if not batch:
+                break
+            if memory_limit is not None:
+                window = _fit_window(batch, batch_size, memory_limit)
+            yield batch
+        cursor.close()
+    finally:
+        if connection.unread_result:
+            # Draining an unbuffered result would read every remaining row
+            connection.shutdown()
+        else:
+            connection.close()
+
+
+def stream_rows(query, params=None, prefetch=500, memory_limit=None):
+    """Generator that yields rows one at a time from stream_batches."""
+    for batch in stream_batches(query, params, prefetch, memory_limit):
+        yield from batch
+
+
+def _read_chunks_from(csv_file, offset, chunk_size):
+    """
+    Yields (rows, invalid, end_offset) for chunks of up to chunk_size
+    records, starting at byte offset (0 means just after the header). rows
+    holds the (name, email, age) tuples, invalid counts records with too
+    few fields, and end_offset is where the next chunk starts.
+    """
+    with open(csv_file, 'rb') as f:
+        header = next(csv.reader([f.readline().decode('utf-8')]))
+        columns = [header.index(name) for name in ('name', 'email', 'age')]
+        if offset:
+            f.seek(offset)
+        while True:
+            lines = []
+            while len(lines) < chunk_size:
+                line = f.readline()
+                if not line:
+                    break
+                record = line.decode('utf-8')
+                # A quoted field may span lines; keep reading until quotes balance
+                while record.count('"') % 2 and line:
+                    line = f.readline()
+                    record += line.decode('utf-8')
+                lines.append(record)
+            if not lines:
+                break
+            rows, invalid = [], 0
+            for row in csv.reader(lines):
+                if not row:
+                    continue
+                if len(row) <= max(columns):
+                    # short record, e.g. a truncated last line
+                    invalid += 1
+                    continue
+                rows.append(tuple(row[i] for i in columns))
+            yield rows, invalid, f.tell()
+
+
+def _load_checkpoint(path, csv_file):
+    """Returns the saved checkpoint for csv_file, or a fresh one."""
+    fresh = {"file": os.path.abspath(csv_file), "offset": 0,
+             "rows": 0, "inserted": 0, "skipped": 0, "invalid": 0}
+    if not os.path.exists(path):
+        return fresh
+    with open(path, encoding='utf-8') as f:
+        checkpoint = json.load(f)
+    if checkpoint.get("file") != fresh["file"]:
+        return fresh
+    return dict(fresh, **checkpoint)
+
+
+def _save_checkpoint(path, checkpoint):
+    """Writes the checkpoint atomically so a crash never leaves half a file."""
+    tmp = f"{path}.tmp"
+    with open(tmp, 'w', encoding='utf-8') as f:
+        json.dump(checkpoint, f)
+    os.replace(tmp, path)
+
+
+def insert_data_resumable(connection, csv_file, checkpoint_path=None,
+                          chunk_size=1000, report_every=5.0):
+    """
+    Loads the CSV in committed chunks, recording the byte offset and row
+    count of the last committed chunk in a checkpoint file. Rerunning after
+    a failure resumes from that offset. Prints throughput and ETA every
+    report_every seconds; the checkpoint is removed once the load finishes.
+    """
+    checkpoint_path = checkpoint_path or f"{csv_file}.checkpoint"
+    checkpoint = _load_checkpoint(checkpoint_path, csv_file)
+    total_bytes = os.path.getsize(csv_file)
+    start_offset = checkpoint["offset"]
+    if start_offset:
+        print(f"Resuming at row {checkpoint['rows']} (byte {start_offset})")
+
+    schema = table_schema(connection)
+    cursor = connection.cursor()
+    start = last_report = time.perf_counter()
+    try:
+        for rows, invalid, offset in _read_chunks_from(csv_file, start_offset, chunk_size):
+            added, dropped = _insert_chunk(cursor, rows, schema)
+            connection.commit()
+            checkpoint.update(
+                offset=offset,
+                rows=checkpoint["rows"] + len(rows),
+                inserted=checkpoint["inserted"] + added,
+                skipped=checkpoint["skipped"] + dropped,
+                invalid=checkpoint["invalid"] + invalid,
+            )
+            _save_checkpoint(checkpoint_path, checkpoint)
+
+            now = time.perf_counter()
+            if now - last_report >= report_every:
+                last_report = now
+                done = offset - start_offset
+                byte_rate = done / (now - start)
+                eta = (total_bytes - offset) / byte_rate if byte_rate else 0
+                print(f"{checkpoint['rows']} rows, "
+                      f"{100 * offset / total_bytes:.1f}% of file, "
+                      f"{byte_rate / 1e6:.2f} MB/s, ETA {eta:.0f}s")
+    finally:
+        cursor.close()
+
+    elapsed = time.perf_counter() - start
+    if os.path.exists(checkpoint_path):
+        os.remove(checkpoint_path)
+    print(f"Loaded {checkpoint['rows']} rows: inserted {checkpoint['inserted']}, "
+          f"skipped {checkpoint['skipped']}, {checkpoint['invalid']} invalid "
+          f"in {elapsed:.2f}s")
+    return checkpoint
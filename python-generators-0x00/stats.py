@@ -0,0 +1,210 @@
+import json
+import math
+import os
+
+seed = __import__('seed')
+
+
+class P2Quantile:
+    """
+    Approximate quantile using the P-squared algorithm (Jain & Chlamtac):
+    five markers, O(1) memory, one pass.
+    """
+
+    def __init__(self, p):
+        self.p = p
+        self.heights = []
+        self.positions = [1, 2, 3, 4, 5]
+        self.desired = [1, 1 + 2 * p, 1 + 4 * p, 3 + 2 * p, 5]
+        self.increments = [0, p / 2, p, (1 + p) / 2, 1]
+
+    def add(self, x):
+        """Feeds one observation."""
+        q = self.heights
+        if len(q) < 5:
+            q.append(x)
+            q.sort()
+            return
+
+        if x < q[0]:
+            q[0] = x
+            k = 0
+        elif x >= q[4]:
+            q[4] = x
+            k = 3
+        else:
+            k = next(i for i in range(4) if q[i] <= x < q[i + 1])
+
+        n = self.positions
+        for i in range(k + 1, 5):
+            n[i] += 1
+        for i in range(5):
+            self.desired[i] += self.increments[i]
+
+        for i in range(1, 4):
+            d = self.desired[i] - n[i]
+            if (d >= 1 and n[i + 1] - n[i] > 1) or (d <= -1 and n[i - 1] - n[i] < -1):
+                d = 1 if d > 0 else -1
+                candidate = q[i] + d / (n[i + 1] - n[i - 1]) * (
+                    (n[i] - n[i - 1] + d) * (q[i + 1] - q[i]) / (n[i + 1] - n[i])
+                    + (n[i + 1] - n[i] - d) * (q[i] - q[i - 1]) / (n[i] - n[i - 1])
+                )
+                if not q[i - 1] < candidate < q[i + 1]:
+                    candidate = q[i] + d * (q[i + d] - q[i]) / (n[i + d] - n[i])
+                q[i] = candidate
+                n[i] += d
+
+    def value(self):
+        """Current estimate, exact while fewer than five values were seen."""
+        q = self.heights
+        if not q:
+            return None
+        if len(q) < 5:
+            return q[min(len(q) - 1, int(round(self.p * (len(q) - 1))))]
+        return q[2]
+
+    def to_dict(self):
+        return {
+            "p": self.p,
+            "heights": self.heights,
+            "positions": self.positions,
+            "desired": self.desired,
+        }
+
+    @classmethod
+    def from_dict(cls, state):
+        quantile = cls(state["p"])
+        quantile.heights = state["heights"]
+        quantile.positions = state["positions"]
+        quantile.desired = state["desired"]
+        return quantile
+
+
+class StreamingStats:
+    """
+    Single-pass count, mean, variance (Welford), min/max and approximate
+    quantiles over a stream of numbers, in constant memory.
+    """
+
+    def __init__(self, quantiles=(0.5, 0.9, 0.99)):
+        self.count = 0
+        self.mean = 0.0
+        self.m2 = 0.0
+        self.min = None
+        self.max = None
+        self.quantiles = {p: P2Quantile(p) for p in quantiles}
+        self.high_water = None
+
+    def add(self, x):
+        """Feeds one observation."""
+        x = float(x)
+        self.count += 1
+        delta = x - self.mean
+        self.mean += delta / self.count
+        self.m2 += delta * (x - self.mean)
+        self.min = x if self.min is None else min(self.min, x)
+        self.max = x if self.max is None else max(self.max, x)
+        for quantile in self.quantiles.values():
+            quantile.add(x)
+
+    def update(self, values):
+        """Feeds every value from an iterable; returns self."""
+        for x in values:
+            self.add(x)
+        return self
+
+    @property
+    def variance(self):
+        """Sample variance, None until two values were seen."""
+        return self.m2 / (self.count - 1) if self.count > 1 else None
+
+    @property
+    def stddev(self):
+        variance = self.variance
+        return math.sqrt(variance) if variance is not None else None
+
+    def summary(self):
+        """Current statistics as a plain dict."""
+        return {
+            "count": self.count,
+            "mean": self.mean if self.count else None,
+            "variance": self.variance,
+            "stddev": self.stddev,
+            "min": self.min,
+            "max": self.max,
+            "quantiles": {p: q.value() for p, q in self.quantiles.items()},
+        }
+
+    def to_dict(self):
+        return {
+            "count": self.count,
+            "mean": self.mean,
+            "m2": self.m2,
+            "min": self.min,
+            "max": self.max,
+            "quantiles": [q.to_dict() for q in self.quantiles.values()],
+            "high_water": (
+                None if self.high_water is None
+                else [self.high_water[0], seed.key_to_json(self.high_water[1])]
+            ),
+        }
+
+    @classmethod
+    def from_dict(cls, state):
+        stats = cls(quantiles=())
+        stats.count = state["count"]
+        stats.mean = state["mean"]
+        stats.m2 = state["m2"]
+        stats.min = state["min"]
+        stats.max = state["max"]
+        stats.quantiles = {
+            q["p"]: P2Quantile.from_dict(q) for q in state["quantiles"]
+        }
+        mark = state.get("high_water")
+        stats.high_water = (
+            None if mark is None else (mark[0], seed.key_from_json(mark[1]))
+        )
+        return stats
+
+    def save(self, path):
+        """Writes the state to path atomically."""
+        tmp = f"{path}.tmp"
+        with open(tmp, "w", encoding="utf-8") as f:
+            json.dump(self.to_dict(), f)
+        os.replace(tmp, path)
+
+    @classmethod
+    def load(cls, path, quantiles=(0.5, 0.9, 0.99)):
+        """Reads saved state, or starts empty if path does not exist."""
+        if not os.path.exists(path):
+            return cls(quantiles)
+        with open(path, encoding="utf-8") as f:
+            return cls.from_dict(json.load(f))
+
+
+def update_age_stats(state_path, batch_size=1000, safety_lag=1.0):
+    """
+    Loads saved age statistics, folds in only the rows inserted since the
+    stored (created_at, user_id) high-water mark, saves the new state and
+    returns it. created_at never changes, so every row is counted exactly
+    once whatever its user_id; later edits to a counted row's age are not
+    picked up. Needs the created_at column (seed.add_created_at).
+    """
+    stats = StreamingStats.load(state_path)
+    query = (
+        "SELECT created_at, user_id, age FROM user_data "
+        "WHERE created_at < NOW(6) - INTERVAL %s MICROSECOND"
+    )
+    params = (int(safety_lag * 1e6),)
+    if stats.high_water is not None:
+        created_at, user_id = stats.high_water
+        query += " AND (created_at > %s OR (created_at = %s AND user_id > %s))"
+        params += (created_at, created_at, user_id)
+    query += " ORDER BY created_at, user_id"
+
+    for created_at, user_id, age in seed.stream_rows(query, params, batch_size):
+        stats.add(age)
+        stats.high_water = (created_at.isoformat(sep=" "), user_id)
+
+    stats.save(state_path)
+    return stats
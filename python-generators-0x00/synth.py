@@ -0,0 +1,160 @@
+"""
+Deterministic synthetic user_data for load testing.
+
+    python synth.py --rows 10000000 --csv users-{part}.csv --processes 8
+    python synth.py --rows 1000000 --db
+
+Row i is a pure function of (--seed, i), so the same arguments always produce
+the same rows no matter how the work is split across processes. Emails are
+unique because they embed the row number.
+"""
+import argparse
+import csv
+import random
+import time
+import uuid
+from concurrent.futures import ProcessPoolExecutor
+
+seed = __import__('seed')
+
+FIRST_NAMES = (
+    "Ada", "Ben", "Chloe", "Dan", "Eve", "Femi", "Grace", "Hassan", "Ivy",
+    "Jomo", "Kemi", "Liam", "Mercy", "Njeri", "Omar", "Priya", "Quinn",
+    "Rosa", "Sam", "Tariq", "Uma", "Victor", "Wanjiru", "Yusuf", "Zara",
+)
+LAST_NAMES = (
+    "Achieng", "Baker", "Chen", "Diallo", "Evans", "Fischer", "Garcia",
+    "Hughes", "Ito", "Kamau", "Lopez", "Mwangi", "Nakamura", "Okafor",
+    "Patel", "Rossi", "Smith", "Tanaka", "Wambui", "Young",
+)
+DOMAINS = ("gmail.com", "yahoo.com", "hotmail.com", "outlook.com", "example.org")
+
+# Chunks of rows share one RNG; chunk boundaries are fixed so output is stable
+CHUNK_ROWS = 10000
+
+
+def _age(rng):
+    """Adult ages, skewed young like most user bases, in 18..100."""
+    return round(min(100.0, max(18.0, rng.lognormvariate(3.5, 0.35))), 2)
+
+
+def generate_rows(start, stop, random_seed=42, binary_ids=False):
+    """
+    Yields (user_id, name, email, age) for rows start..stop-1.
+    Every CHUNK_ROWS block gets its own RNG derived from random_seed.
+    """
+    for chunk in range(start // CHUNK_ROWS, (stop - 1) // CHUNK_ROWS + 1):
+        rng = random.Random(random_seed * 1_000_003 + chunk)
+        first = chunk * CHUNK_ROWS
+        for i in range(first, first + CHUNK_ROWS):
+            user_id = uuid.UUID(int=rng.getrandbits(128), version=4)
+            first_name = rng.choice(FIRST_NAMES)
+            last_name = rng.choice(LAST_NAMES)
+            domain = rng.choice(DOMAINS)
+            age = _age(rng)
+            if i < start:
+                continue
+            if i >= stop:
+                return
+            yield (
+                user_id.bytes if binary_ids else str(user_id),
+                f"{first_name} {last_name}",
+                f"{first_name}.{last_name}.{i}@{domain}".lower(),
+                age,
+            )
+
+
+def _slices(rows, parts):
+    """Splits range(rows) into parts contiguous, CHUNK_ROWS-aligned slices."""
+    chunks = -(-rows // CHUNK_ROWS)
+    per_part = -(-chunks // parts)
+    return [
+        (p * per_part * CHUNK_ROWS, min(rows, (p + 1) * per_part * CHUNK_ROWS))
+        for p in range(parts)
+        if p * per_part * CHUNK_ROWS < rows
+    ]
+
+
+def write_csv(path, start, stop, random_seed=42):
+    """Writes rows start..stop-1 as name,email,age CSV, like users_data.csv."""
+    with open(path, "w", newline="", encoding="utf-8") as f:
+        writer = csv.writer(f, quoting=csv.QUOTE_ALL)
+        writer.writerow(("name", "email", "age"))
+        for _, name, email, age in generate_rows(start, stop, random_seed):
+            writer.writerow((name, email, age))
+    return stop - start
+
+
+def insert_rows(start, stop, random_seed=42, batch_size=5000):
+    """Bulk-inserts rows start..stop-1 straight into user_data."""
+    connection = seed.get_connection()
+    try:
+        binary_ids = seed.table_schema(connection)["binary_ids"]
+        cursor = connection.cursor()
+        batch = []
+        for row in generate_rows(start, stop, random_seed, binary_ids):
+            batch.append(row)
+            if len(batch) == batch_size:
+                cursor.executemany(
+                    "INSERT INTO user_data (user_id, name, email, age) "
+                    "VALUES (%s, %s, %s, %s)",
+                    batch,
+                )
+                connection.commit()
+                batch = []
+        if batch:
+            cursor.executemany(
+                "INSERT INTO user_data (user_id, name, email, age) "
+                "VALUES (%s, %s, %s, %s)",
+                batch,
+            )
+            connection.commit()
+        cursor.close()
+    finally:
+        connection.close()
+    return stop - start
+
+
+def generate(rows, random_seed=42, csv_template=None, processes=None, batch_size=5000):
+    """
+    Produces rows synthetic users across a process pool, either into CSV
+    files (csv_template containing "{part}") or into user_data.
+    Returns the number of rows written.
+    """
+    processes = processes or 1
+    if csv_template and processes > 1 and "{part}" not in csv_template:
+        raise ValueError("csv_template needs {part} when using several processes")
+    slices = _slices(rows, processes)
+    start = time.perf_counter()
+    with ProcessPoolExecutor(max_workers=processes) as pool:
+        if csv_template:
+            futures = [
+                pool.submit(write_csv, csv_template.format(part=part), lo, hi, random_seed)
+                for part, (lo, hi) in enumerate(slices)
+            ]
+        else:
+            futures = [
+                pool.submit(insert_rows, lo, hi, random_seed, batch_size)
+                for lo, hi in slices
+            ]
+        written = sum(future.result() for future in futures)
+    elapsed = time.perf_counter() - start
+    print(f"Generated {written} rows in {elapsed:.2f}s "
+          f"({written / elapsed if elapsed else 0:.0f} rows/sec)")
+    return written
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--rows", type=int, required=True)
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--processes", type=int, default=1)
+    target = parser.add_mutually_exclusive_group(required=True)
+    target.add_argument("--csv", help="output path template containing {part}")
+    target.add_argument("--db", action="store_true", help="insert into user_data")
+    args = parser.parse_args(argv)
+    generate(args.rows, args.seed, args.csv, args.processes)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,91 @@
+#!/usr/bin/env python3
+"""Unit tests for async_stream"""
+import asyncio
+import types
+import unittest
+from unittest.mock import patch
+
+async_stream = __import__('async_stream')
+
+
+class FakeCursor:
+    """Server-side cursor over a fixed list of rows."""
+
+    def __init__(self, rows):
+        self.rows = list(rows)
+        self.closed = False
+
+    async def execute(self, query):
+        pass
+
+    async def fetchmany(self, size):
+        batch, self.rows = self.rows[:size], self.rows[size:]
+        return batch
+
+    async def close(self):
+        # aiomysql reads the rest of an unbuffered result here
+        self.rows = []
+        self.closed = True
+
+
+class FakeConnection:
+    """Records whether it was dropped or closed politely."""
+
+    def __init__(self, rows):
+        self.cursor_ = FakeCursor(rows)
+        self.dropped = False
+        self.quit = False
+
+    async def cursor(self, cursor_class):
+        return self.cursor_
+
+    def close(self):
+        self.dropped = True
+
+    async def ensure_closed(self):
+        self.quit = True
+
+
+class TestNativeBatches(unittest.TestCase):
+    """
+    Test case for closing the aiomysql connection behind _native_batches.
+    """
+
+    def setUp(self):
+        self.connection = FakeConnection(range(10))
+
+        async def connect(**config):
+            return self.connection
+
+        fake = types.SimpleNamespace(connect=connect, SSCursor=object)
+        patcher = patch.object(async_stream, "aiomysql", fake)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def test_exhausted_result_closes_politely(self):
+        """Reading every row closes the cursor and the connection normally."""
+        async def read():
+            return [b async for b in async_stream._native_batches("SELECT", 4)]
+
+        batches = asyncio.run(read())
+        self.assertEqual(batches, [[0, 1, 2, 3], [4, 5, 6, 7], [8, 9]])
+        self.assertTrue(self.connection.cursor_.closed)
+        self.assertTrue(self.connection.quit)
+        self.assertFalse(self.connection.dropped)
+
+    def test_abandoned_result_drops_connection(self):
+        """Stopping early drops the connection without draining the rows."""
+        async def read_one():
+            batches = async_stream._native_batches("SELECT", 4)
+            first = await batches.__anext__()
+            await batches.aclose()
+            return first
+
+        self.assertEqual(asyncio.run(read_one()), [0, 1, 2, 3])
+        self.assertTrue(self.connection.dropped)
+        self.assertFalse(self.connection.cursor_.closed)
+        self.assertEqual(len(self.connection.cursor_.rows), 6)
+
+
+if __name__ == "__main__":
+    unittest.main()
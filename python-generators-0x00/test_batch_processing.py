@@ -0,0 +1,69 @@
+#!/usr/bin/env python3
+"""Unit tests for the prefetching batch reader"""
+import importlib
+import threading
+import unittest
+
+batch_processing = importlib.import_module("1-batch_processing")
+
+
+class FakeSource:
+    """Endless batch source that records whether it was closed."""
+
+    def __init__(self):
+        self.closed = threading.Event()
+
+    def __call__(self, batch_size):
+        try:
+            n = 0
+            while True:
+                yield [n] * batch_size
+                n += 1
+        finally:
+            self.closed.set()
+
+
+class TestPrefetch(unittest.TestCase):
+    """
+    Test case for stream_users_in_batches_prefetch and PrefetchingBatches.
+    """
+
+    def test_break_stops_producer(self):
+        """Leaving a for loop early closes the source and ends the thread."""
+        source = FakeSource()
+        before = threading.active_count()
+        for batch in batch_processing.stream_users_in_batches_prefetch(3, source=source):
+            self.assertEqual(batch, [0, 0, 0])
+            break
+        self.assertTrue(source.closed.wait(2))
+        self.assertEqual(threading.active_count(), before)
+
+    def test_reads_everything_in_order(self):
+        """A finite source is delivered completely and in order."""
+        batches = [[1, 2], [3, 4], [5]]
+        result = list(batch_processing.stream_users_in_batches_prefetch(
+            2, source=lambda batch_size: iter(batches)
+        ))
+        self.assertEqual(result, batches)
+
+    def test_source_error_reraised(self):
+        """An error in the source surfaces in the consumer."""
+        def failing(batch_size):
+            yield [1]
+            raise RuntimeError("lost connection")
+
+        with self.assertRaises(RuntimeError):
+            list(batch_processing.stream_users_in_batches_prefetch(1, source=failing))
+
+    def test_context_manager_stats(self):
+        """PrefetchingBatches counts delivered batches and closes on exit."""
+        source = FakeSource()
+        with batch_processing.PrefetchingBatches(2, source=source) as prefetcher:
+            next(prefetcher)
+            next(prefetcher)
+        self.assertEqual(prefetcher.stats["batches"], 2)
+        self.assertTrue(source.closed.wait(2))
+
+
+if __name__ == "__main__":
+    unittest.main()
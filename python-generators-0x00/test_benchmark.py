@@ -0,0 +1,56 @@
+#!/usr/bin/env python3
+"""Unit tests for benchmark.run"""
+import io
+import os
+import unittest
+from unittest.mock import patch
+
+benchmark = __import__('benchmark')
+
+
+def _rows():
+    yield from range(5)
+
+
+def _fails():
+    yield 1
+    raise RuntimeError("lost connection")
+
+
+def _dies():
+    os._exit(3)
+    yield
+
+
+class TestRun(unittest.TestCase):
+    """
+    Test case for the per-reader child processes of benchmark.run.
+    """
+
+    def run_readers(self, readers):
+        with patch.object(benchmark, "ensure_rows", return_value=5), \
+                patch.object(benchmark.seed, "get_pool"), \
+                patch.object(benchmark, "_readers", return_value=readers), \
+                patch.object(benchmark.sys, "stdout", io.StringIO()):
+            return benchmark.run(5, [], [])
+
+    def test_reader_timings(self):
+        """A reader that finishes sends back its row count."""
+        (record,) = self.run_readers([("rows", None, _rows)])
+        self.assertEqual(record["rows"], 5)
+        self.assertNotIn("error", record)
+
+    def test_reader_error_is_recorded(self):
+        """An exception in the child comes back as an error record."""
+        records = self.run_readers([("fails", None, _fails), ("rows", None, _rows)])
+        self.assertEqual(records[0]["error"], "RuntimeError: lost connection")
+        self.assertEqual(records[1]["rows"], 5)
+
+    def test_dead_child_does_not_hang(self):
+        """A child that exits without sending gives an error, not a hang."""
+        (record,) = self.run_readers([("dies", None, _dies)])
+        self.assertIn("exited with code 3", record["error"])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,79 @@
+#!/usr/bin/env python3
+"""Unit tests for instrument"""
+import atexit
+import sqlite3
+import time
+import unittest
+from unittest.mock import patch
+
+instrument = __import__('instrument')
+
+
+class TestInstrumentedCursor(unittest.TestCase):
+    """
+    Test case for InstrumentedCursor timing and counters.
+    """
+
+    def setUp(self):
+        self.conn = sqlite3.connect(":memory:")
+        self.conn.execute("CREATE TABLE user_data (user_id TEXT, age REAL)")
+        self.conn.executemany(
+            "INSERT INTO user_data VALUES (?, ?)", [(str(i), i) for i in range(10)]
+        )
+        self.stats = instrument.QueryStats(slow_threshold=0.05)
+        self.wrapped = instrument.InstrumentedConnection(self.conn, self.stats)
+
+    def tearDown(self):
+        self.conn.close()
+
+    def test_consumer_time_not_counted(self):
+        """Work between fetches shows up in wall time only, not as a slow query."""
+        cursor = self.wrapped.cursor()
+        cursor.execute("SELECT user_id, age FROM user_data")
+        while cursor.fetchmany(5):
+            time.sleep(0.03)
+        cursor.close()
+
+        [entry] = self.stats.top()
+        self.assertEqual(entry["rows"], 10)
+        self.assertLess(entry["seconds"], 0.05)
+        self.assertGreaterEqual(entry["wall_seconds"], 0.06)
+        self.assertEqual(len(self.stats.slow), 0)
+
+    def test_iteration_counts_rows(self):
+        """Iterating the cursor records every row once the result ends."""
+        cursor = self.wrapped.cursor()
+        cursor.execute("SELECT user_id FROM user_data WHERE age > ?", (4,))
+        self.assertEqual(len(list(cursor)), 5)
+        [entry] = self.stats.top()
+        self.assertEqual((entry["calls"], entry["rows"]), (1, 5))
+
+    def test_slow_query_recorded(self):
+        """A statement whose own time passes the threshold is kept as slow."""
+        self.stats.slow_threshold = 0.0
+        cursor = self.wrapped.cursor()
+        cursor.execute("SELECT COUNT(*) FROM user_data")
+        cursor.fetchall()
+        self.assertEqual(len(self.stats.slow), 1)
+
+
+class TestEnable(unittest.TestCase):
+    """
+    Test case for enable/disable.
+    """
+
+    def test_enable_twice_reports_once(self):
+        """Calling enable() again does not register a second report at exit."""
+        registered = []
+        with patch.object(atexit, "register", side_effect=lambda f, *a: registered.append(f)), \
+                patch.object(atexit, "unregister",
+                             side_effect=lambda f: registered.remove(f) if f in registered else None):
+            instrument.enable()
+            instrument.enable()
+            self.assertEqual(registered.count(instrument.report), 1)
+            instrument.disable()
+        self.assertIsNone(instrument.seed.cursor_wrapper)
+
+
+if __name__ == "__main__":
+    unittest.main()
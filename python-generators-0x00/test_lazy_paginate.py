@@ -0,0 +1,108 @@
+#!/usr/bin/env python3
+"""Unit tests for 2-lazy_paginate"""
+import base64
+import json
+import unittest
+from unittest.mock import patch
+
+paginate = __import__('2-lazy_paginate')
+
+
+class FakeCursor:
+    """Answers the keyset queries from a list of rows sorted by user_id."""
+
+    column_names = ("user_id", "name", "email", "age")
+
+    def __init__(self, connection):
+        self.connection = connection
+        self.rows = []
+
+    def execute(self, query, params):
+        self.connection.queries.append((query, params))
+        rows = self.connection.rows
+        if "WHERE user_id > %s" in query:
+            last_seen, limit = params
+            rows = [row for row in rows if row[0] > last_seen]
+        else:
+            (limit,) = params
+        self.rows = rows[:limit]
+
+    def fetchall(self):
+        return self.rows
+
+    def close(self):
+        pass
+
+
+class FakeConnection:
+    """Holds the rows and records the queries run against them."""
+
+    def __init__(self, rows):
+        self.rows = sorted(rows)
+        self.queries = []
+        self.closed = False
+
+    def cursor(self):
+        return FakeCursor(self)
+
+    def close(self):
+        self.closed = True
+
+
+def _rows(ids):
+    return [(user_id, f"user{i}", f"user{i}@example.com", 20 + i)
+            for i, user_id in enumerate(ids)]
+
+
+class TestLazyPaginate(unittest.TestCase):
+    """
+    Test case for keyset pagination and its resumable cursor tokens.
+    """
+
+    def setUp(self):
+        self.ids = [bytes([i * 30]) + bytes(15) for i in range(7)]
+        self.connection = FakeConnection(_rows(self.ids))
+        patcher = patch.object(
+            paginate.seed, "get_connection", return_value=self.connection
+        )
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def test_keyset_pages(self):
+        """Pages follow user_id order and seek past the last key, not an offset."""
+        pages = list(paginate.lazy_paginate(3))
+        self.assertEqual([len(page) for page in pages], [3, 3, 1])
+        self.assertEqual([row[0] for page in pages for row in page], self.ids)
+        self.assertNotIn("OFFSET", " ".join(q for q, _ in self.connection.queries))
+        self.assertEqual(self.connection.queries[1][1], (self.ids[2], 3))
+        self.assertTrue(self.connection.closed)
+
+    def test_token_resumes_after_page(self):
+        """A token from one walk resumes the next right after its page."""
+        walk = paginate.lazy_paginate_with_cursor(3)
+        _, token = next(walk)
+        walk.close()
+
+        self.assertEqual(paginate.decode_cursor(token), ("user_id", self.ids[2]))
+        resumed = [row[0] for page, _ in paginate.lazy_paginate_with_cursor(3, token)
+                   for row in page]
+        self.assertEqual(resumed, self.ids[3:])
+
+    def test_token_round_trip(self):
+        """Binary and text keys survive encoding as an opaque token."""
+        for last_seen in (self.ids[4], "6f1c0d9e-0000-4000-8000-000000000000"):
+            token = paginate.encode_cursor("user_id", last_seen)
+            self.assertIsInstance(token, str)
+            self.assertEqual(paginate.decode_cursor(token), ("user_id", last_seen))
+
+    def test_forged_token_key_rejected(self):
+        """A token naming a column outside SORT_KEYS is refused before any SQL."""
+        payload = {"key": "age; DROP TABLE user_data", "last": "x"}
+        token = base64.urlsafe_b64encode(json.dumps(payload).encode()).decode()
+        with self.assertRaises(ValueError):
+            next(paginate.lazy_paginate_with_cursor(3, token))
+        self.assertEqual(self.connection.queries, [])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,135 @@
+#!/usr/bin/env python3
+"""Unit tests for seed.migrate_to_performance_schema"""
+import re
+import unittest
+import unittest.mock
+
+seed = __import__('seed')
+
+
+class FakeServer:
+    """
+    Just enough of MySQL's behaviour for the migration: tracks the columns
+    and indexes of user_data and rejects indexes on missing columns.
+    """
+
+    def __init__(self, columns, indexes):
+        self.columns = dict(columns)
+        self.indexes = dict(indexes)
+        self.ids = [f"{i:08d}-0000-4000-8000-000000000000" for i in range(25)]
+        self.converted = set()
+        self.statements = []
+
+    def execute(self, query, params=()):
+        self.statements.append(query)
+        if "information_schema.columns" in query:
+            name = re.search(r"column_name = '(\w+)'", query).group(1)
+            if query.startswith("SELECT COUNT"):
+                return [(int(name in self.columns),)]
+            return [(self.columns[name],)] if name in self.columns else []
+        if "information_schema.statistics" in query:
+            return [(name, int(not unique), column)
+                    for name, (column, unique) in self.indexes.items()]
+        if query.startswith("SELECT email"):
+            return []
+        if query.startswith("SELECT user_id"):
+            last, offset = params
+            later = [i for i in self.ids if i > last]
+            return [(later[offset],)] if offset < len(later) else []
+        if query.startswith("UPDATE"):
+            if "user_id > %s" not in query:
+                raise AssertionError("batch UPDATE must seek on the primary key")
+            low, high = params[0], params[1] if len(params) > 1 else "~"
+            batch = {i for i in self.ids if low < i <= high} - self.converted
+            self.converted |= batch
+            return len(batch)
+        if query.startswith("ALTER TABLE"):
+            self.alter(query[len("ALTER TABLE user_data "):])
+            return []
+        raise AssertionError(f"Unexpected query {query}")
+
+    def alter(self, spec):
+        columns = dict(self.columns)
+        for clause in re.split(r",\s*(?![^()]*\))", spec):
+            added = re.match(r"ADD (?:UNIQUE )?INDEX (\w+) \((\w+)", clause)
+            if clause.startswith("ADD COLUMN"):
+                columns[clause.split()[2]] = clause.split()[3].lower()
+            elif clause.startswith("DROP COLUMN"):
+                del columns[clause.split()[2]]
+            elif clause.startswith("CHANGE"):
+                _, old, new, kind = clause.split()[:4]
+                del columns[old]
+                columns[new] = kind.split("(")[0].lower()
+            elif added:
+                if added.group(2) not in columns:
+                    raise seed.mysql.connector.Error(
+                        f"Key column '{added.group(2)}' doesn't exist in table"
+                    )
+                self.indexes[added.group(1)] = (added.group(2), "UNIQUE" in clause)
+        self.columns = columns
+
+
+class FakeCursor:
+    def __init__(self, server):
+        self.server = server
+        self.rows = []
+        self.rowcount = 0
+
+    def execute(self, query, params=()):
+        result = self.server.execute(query, params)
+        if isinstance(result, int):
+            self.rowcount, self.rows = result, []
+        else:
+            self.rowcount, self.rows = len(result), list(result)
+
+    def fetchone(self):
+        return self.rows.pop(0) if self.rows else None
+
+    def fetchall(self):
+        rows, self.rows = self.rows, []
+        return rows
+
+    def close(self):
+        pass
+
+
+class FakeConnection:
+    def __init__(self, server):
+        self.server = server
+
+    def cursor(self):
+        return FakeCursor(self.server)
+
+    def commit(self):
+        pass
+
+
+class TestMigrate(unittest.TestCase):
+    """
+    Test case for migrating the baseline user_data table.
+    """
+
+    def test_baseline_table_gets_updated_at_first(self):
+        """A table without updated_at is migrated without a missing-column error."""
+        server = FakeServer(
+            columns={"user_id": "char", "name": "varchar",
+                     "email": "varchar", "age": "decimal"},
+            indexes={"PRIMARY": ("user_id", True), "user_id": ("user_id", False)},
+        )
+        with unittest.mock.patch("builtins.print"):
+            seed.migrate_to_performance_schema(FakeConnection(server), batch_size=10)
+
+        self.assertEqual(server.columns["user_id"], "binary")
+        self.assertIn("updated_at", server.columns)
+        self.assertIn("created_at", server.columns)
+        self.assertIn("idx_updated_at", server.indexes)
+        self.assertIn("idx_created_at", server.indexes)
+        self.assertIn("idx_email", server.indexes)
+        updates = [q for q in server.statements if q.startswith("UPDATE")]
+        self.assertEqual(len(updates), 3)
+        self.assertIn("updated_at = updated_at", updates[0])
+        self.assertEqual(server.converted, set(server.ids))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,100 @@
+#!/usr/bin/env python3
+"""Unit tests for partitions.merge_batches and parallel_scan"""
+import threading
+import unittest
+from unittest.mock import patch
+
+partitions = __import__('partitions')
+
+
+class OpenSources:
+    """Batch source factories that record how many are open at once."""
+
+    def __init__(self, count, batches=3):
+        self.count = count
+        self.batches = batches
+        self.open = 0
+        self.peak = 0
+        self.started = set()
+        self._lock = threading.Lock()
+
+    def factory(self, index):
+        def batches():
+            with self._lock:
+                self.started.add(index)
+                self.open += 1
+                self.peak = max(self.peak, self.open)
+            try:
+                for n in range(self.batches):
+                    yield [(index, n)]
+            finally:
+                with self._lock:
+                    self.open -= 1
+        return batches
+
+    def factories(self):
+        return [self.factory(i) for i in range(self.count)]
+
+
+class TestMergeBatches(unittest.TestCase):
+    """
+    Test case for the ordered, unordered and keyed merge modes.
+    """
+
+    def test_ordered_keeps_window_open(self):
+        """Ordered mode drains sources in turn with only window of them open."""
+        sources = OpenSources(8)
+        rows = list(partitions.merge_batches(
+            sources.factories(), ordered=True, workers=8, max_pending=1, window=2
+        ))
+        self.assertEqual(rows, [(i, n) for i in range(8) for n in range(3)])
+        self.assertLessEqual(sources.peak, 2)
+
+    def test_ordered_does_not_start_far_sources(self):
+        """Sources beyond the window are not opened before the consumer gets near."""
+        sources = OpenSources(6)
+        merged = partitions.merge_batches(
+            sources.factories(), ordered=True, max_pending=1, window=2
+        )
+        self.assertEqual(next(merged), (0, 0))
+        self.assertTrue(sources.started <= {0, 1})
+        merged.close()
+
+    def test_unordered_yields_every_row(self):
+        """Unordered mode yields every row once with fewer workers than sources."""
+        sources = OpenSources(5)
+        rows = list(partitions.merge_batches(sources.factories(), workers=2))
+        self.assertEqual(sorted(rows), [(i, n) for i in range(5) for n in range(3)])
+        self.assertLessEqual(sources.peak, 2)
+
+    def test_keyed_merge(self):
+        """A key k-way merges the sources."""
+        factories = [lambda: iter([[1, 4], [7]]), lambda: iter([[2, 3], [9]])]
+        self.assertEqual(
+            list(partitions.merge_batches(factories, key=lambda x: x)),
+            [1, 2, 3, 4, 7, 9],
+        )
+
+
+class FakePool:
+    """Only exposes the size parallel_scan reads."""
+
+    max_size = 3
+
+
+class TestParallelScan(unittest.TestCase):
+    """
+    Test case for the pool-sized worker cap of parallel_scan.
+    """
+
+    def test_workers_capped_at_pool_size(self):
+        """More partitions than pooled connections use at most max_size workers."""
+        ranges = [(i, i + 1) for i in range(16)]
+        with patch.object(partitions.seed, "get_pool", return_value=FakePool()), \
+                patch.object(partitions, "merge_batches", return_value=iter(())) as merge:
+            list(partitions.parallel_scan(ranges=ranges))
+        self.assertEqual(merge.call_args[0][3], 3)
+
+
+if __name__ == "__main__":
+    unittest.main()
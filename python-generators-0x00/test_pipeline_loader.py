@@ -0,0 +1,83 @@
+#!/usr/bin/env python3
+"""Unit tests for pipeline_loader parsing"""
+import os
+import tempfile
+import unittest
+
+pipeline_loader = __import__('pipeline_loader')
+
+
+class TestParseRange(unittest.TestCase):
+    """
+    Test case for split_file and parse_range.
+    """
+
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.tmp.name, "users.csv")
+        with open(self.path, "w", encoding="utf-8", newline="") as f:
+            f.write(
+                '"name","email","age"\n'
+                '"Ada","ada@example.org","36"\n'
+                '"Short","short@example.org"\n'
+                '"Bad age","bad@example.org","old"\n'
+                '"No at","nowhere","40"\n'
+                '\n'
+                '"Ben","ben@example.org","51.5"\n'
+            )
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def test_invalid_records_counted(self):
+        """Short and malformed records are counted, not raised."""
+        columns = pipeline_loader._header_columns(self.path)
+        [(start, end)] = pipeline_loader.split_file(self.path, 1 << 20)
+        rows, invalid = pipeline_loader.parse_range(self.path, start, end, columns)
+        self.assertEqual(rows, [
+            ("Ada", "ada@example.org", "36"),
+            ("Ben", "ben@example.org", "51.5"),
+        ])
+        self.assertEqual(invalid, 3)
+
+    def test_ranges_cover_file(self):
+        """Byte ranges split on line boundaries lose and repeat no rows."""
+        columns = pipeline_loader._header_columns(self.path)
+        parsed, invalid = [], 0
+        for start, end in pipeline_loader.split_file(self.path, 10):
+            rows, bad = pipeline_loader.parse_range(self.path, start, end, columns)
+            parsed += rows
+            invalid += bad
+        self.assertEqual([row[0] for row in parsed], ["Ada", "Ben"])
+        self.assertEqual(invalid, 3)
+
+
+class BrokenConnection:
+    """Connection whose cursor() fails, like a dropped server."""
+
+    def cursor(self, *args, **kwargs):
+        raise pipeline_loader.seed.mysql.connector.Error("connection lost")
+
+
+class TestLoadPipelined(unittest.TestCase):
+    """
+    Test case for error handling in load_pipelined.
+    """
+
+    def test_writer_setup_failure_raises(self):
+        """A writer that cannot start is reported, and parsing never blocks."""
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, "users.csv")
+            with open(path, "w", encoding="utf-8") as f:
+                f.write('"name","email","age"\n')
+                for i in range(50):
+                    f.write(f'"User {i}","user{i}@example.org","{20 + i}"\n')
+            with self.assertRaises(pipeline_loader.seed.mysql.connector.Error):
+                pipeline_loader.load_pipelined(
+                    BrokenConnection(), path, chunk_bytes=64,
+                    processes=1, queue_size=1,
+                )
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,86 @@
+#!/usr/bin/env python3
+"""Unit tests for seed.ConnectionPool"""
+import unittest
+
+seed = __import__('seed')
+
+
+class FakeConnection:
+    """Stands in for a mysql.connector connection."""
+
+    def __init__(self):
+        self.in_transaction = False
+        self.unread_result = False
+        self.rollbacks = 0
+        self.closed = False
+
+    def is_connected(self):
+        return not self.closed
+
+    def rollback(self):
+        self.rollbacks += 1
+        self.in_transaction = False
+
+    def close(self):
+        self.closed = True
+
+    shutdown = close
+
+
+class TestConnectionPool(unittest.TestCase):
+    """
+    Test case for checkout, release and size limits of ConnectionPool.
+    """
+
+    def setUp(self):
+        self.pool = seed.ConnectionPool(
+            FakeConnection, min_size=0, max_size=2, timeout=0.05
+        )
+
+    def test_double_close_returns_once(self):
+        """Closing a handle twice does not put the connection back twice."""
+        first = self.pool.acquire()
+        first.close()
+        first.close()
+        a = self.pool.acquire()
+        b = self.pool.acquire()
+        self.assertIsNot(a._connection, b._connection)
+        self.assertEqual(self.pool.stats()["idle"], 0)
+
+    def test_stale_handle_cannot_release_new_checkout(self):
+        """A closed handle does not affect the next borrower of its connection."""
+        first = self.pool.acquire()
+        first.close()
+        second = self.pool.acquire()
+        self.assertIs(first._connection, second._connection)
+        first.close()
+        self.assertEqual(self.pool.stats()["idle"], 0)
+
+    def test_release_rolls_back_open_transaction(self):
+        """An open transaction (and its snapshot) is ended on release."""
+        pooled = self.pool.acquire()
+        pooled._connection.in_transaction = True
+        pooled.close()
+        self.assertEqual(pooled._connection.rollbacks, 1)
+
+    def test_timeout_when_exhausted(self):
+        """A checkout past max_size waits, then raises PoolTimeoutError."""
+        self.pool.acquire()
+        self.pool.acquire()
+        with self.assertRaises(seed.PoolTimeoutError):
+            self.pool.acquire()
+        self.assertEqual(self.pool.stats()["timeouts"], 1)
+
+    def test_unhealthy_connection_replaced(self):
+        """A connection that went away while idle is dropped on checkout."""
+        pooled = self.pool.acquire()
+        connection = pooled._connection
+        pooled.close()
+        connection.closed = True
+        fresh = self.pool.acquire()
+        self.assertIsNot(fresh._connection, connection)
+        self.assertEqual(self.pool.stats()["size"], 1)
+
+
+if __name__ == "__main__":
+    unittest.main()
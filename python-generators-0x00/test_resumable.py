@@ -0,0 +1,107 @@
+#!/usr/bin/env python3
+"""Unit tests for seed.insert_data_resumable"""
+import os
+import tempfile
+import unittest
+from unittest.mock import patch
+
+seed = __import__('seed')
+
+SCHEMA = {"binary_ids": False, "unique_email": True, "indexes": set()}
+
+
+class FakeCursor:
+    """Records INSERT IGNORE batches; can fail on a chosen batch."""
+
+    def __init__(self, table, fail_on=None):
+        self.table = table
+        self.fail_on = fail_on
+        self.batches = 0
+        self.rowcount = 0
+
+    def executemany(self, query, values):
+        self.batches += 1
+        if self.batches == self.fail_on:
+            raise seed.mysql.connector.Error("connection lost")
+        new = [row for row in values if row[2] not in self.table]
+        for row in new:
+            self.table[row[2]] = row
+        self.rowcount = len(new)
+
+    def execute(self, query, params=()):
+        raise AssertionError(f"Unexpected query {query}")
+
+    def close(self):
+        pass
+
+
+class FakeConnection:
+    def __init__(self, cursor):
+        self._cursor = cursor
+        self.commits = 0
+
+    def cursor(self):
+        return self._cursor
+
+    def commit(self):
+        self.commits += 1
+
+
+class TestInsertDataResumable(unittest.TestCase):
+    """
+    Test case for the checkpointed CSV load.
+    """
+
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.csv = os.path.join(self.tmp.name, "users.csv")
+        self.checkpoint = self.csv + ".checkpoint"
+        with open(self.csv, "w", encoding="utf-8", newline="") as f:
+            f.write('"name","email","age"\n')
+            for i in range(7):
+                f.write(f'"User {i}","user{i}@example.org","{20 + i}"\n')
+            f.write('"Short","short@example.org"\n')
+            f.write("\n\n")
+        self.table = {}
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def load(self, cursor):
+        with patch.object(seed, "table_schema", return_value=SCHEMA), \
+                patch("builtins.print"):
+            return seed.insert_data_resumable(
+                FakeConnection(cursor), self.csv, self.checkpoint, chunk_size=2
+            )
+
+    def test_full_load(self):
+        """Blank trailing lines and short records do not break the load."""
+        result = self.load(FakeCursor(self.table))
+        self.assertEqual(
+            (result["rows"], result["inserted"], result["invalid"]), (7, 7, 1)
+        )
+        self.assertFalse(os.path.exists(self.checkpoint))
+
+    def test_resume_after_failure(self):
+        """A failed load resumes at the last committed chunk."""
+        with self.assertRaises(seed.mysql.connector.Error):
+            self.load(FakeCursor(self.table, fail_on=3))
+        saved = seed._load_checkpoint(self.checkpoint, self.csv)
+        self.assertEqual((saved["rows"], saved["inserted"]), (4, 4))
+
+        cursor = FakeCursor(self.table)
+        result = self.load(cursor)
+        self.assertEqual(result["rows"], 7)
+        self.assertEqual(result["inserted"], 7)
+        self.assertEqual(len(self.table), 7)
+        # only the chunks after the checkpoint were sent again
+        self.assertEqual(cursor.batches, 2)
+        self.assertFalse(os.path.exists(self.checkpoint))
+
+    def test_empty_chunk_inserts_nothing(self):
+        """_insert_chunk never sends an empty IN () lookup."""
+        self.assertEqual(seed._insert_chunk(FakeCursor(self.table), []), (0, 0))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,106 @@
+#!/usr/bin/env python3
+"""Unit tests for stats"""
+import datetime
+import json
+import os
+import random
+import statistics
+import tempfile
+import unittest
+from unittest.mock import patch
+
+stats = __import__('stats')
+
+
+class TestP2Quantile(unittest.TestCase):
+    """
+    Test case for the P2Quantile estimator.
+    """
+
+    def test_exact_below_five_values(self):
+        """Fewer than five values give an exact order statistic."""
+        quantile = stats.P2Quantile(0.5)
+        self.assertIsNone(quantile.value())
+        for x in (3, 1, 2):
+            quantile.add(x)
+        self.assertEqual(quantile.value(), 2)
+
+    def test_median_estimate(self):
+        """The estimate lands close to the true median of a large sample."""
+        rng = random.Random(7)
+        values = [rng.uniform(0, 100) for _ in range(20000)]
+        quantile = stats.P2Quantile(0.5)
+        for x in values:
+            quantile.add(x)
+        self.assertAlmostEqual(quantile.value(), statistics.median(values), delta=1.5)
+
+
+class TestStreamingStats(unittest.TestCase):
+    """
+    Test case for StreamingStats and its saved state.
+    """
+
+    def setUp(self):
+        rng = random.Random(1)
+        self.values = [rng.gauss(40, 12) for _ in range(1000)]
+
+    def test_matches_statistics_module(self):
+        """Welford mean and variance agree with the statistics module."""
+        summary = stats.StreamingStats().update(self.values).summary()
+        self.assertEqual(summary["count"], len(self.values))
+        self.assertAlmostEqual(summary["mean"], statistics.mean(self.values))
+        self.assertAlmostEqual(summary["variance"], statistics.variance(self.values))
+        self.assertEqual(summary["min"], min(self.values))
+        self.assertEqual(summary["max"], max(self.values))
+
+    def test_round_trip_continues_identically(self):
+        """Saving halfway and continuing gives the same result as one pass."""
+        whole = stats.StreamingStats().update(self.values)
+
+        first = stats.StreamingStats().update(self.values[:500])
+        first.high_water = ("2024-01-02 03:04:05.000006", b"\x01\x02")
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, "state.json")
+            first.save(path)
+            resumed = stats.StreamingStats.load(path)
+        resumed.update(self.values[500:])
+
+        self.assertEqual(resumed.high_water, first.high_water)
+        self.assertEqual(resumed.summary(), whole.summary())
+
+
+class TestUpdateAgeStats(unittest.TestCase):
+    """
+    Test case for update_age_stats and its (created_at, user_id) mark.
+    """
+
+    def test_resumes_after_mark(self):
+        """The second run filters on the mark saved by the first."""
+        first_rows = [
+            (datetime.datetime(2024, 1, 1, 0, 0, 1), "b", 30),
+            (datetime.datetime(2024, 1, 1, 0, 0, 2), "a", 50),
+        ]
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, "ages.json")
+            with patch.object(stats.seed, "stream_rows", return_value=first_rows) as rows:
+                result = stats.update_age_stats(path)
+            self.assertEqual(result.count, 2)
+            query, params, _ = rows.call_args[0]
+            self.assertNotIn("user_id >", query)
+            with open(path, encoding="utf-8") as f:
+                self.assertEqual(
+                    json.load(f)["high_water"], ["2024-01-01 00:00:02", "a"]
+                )
+
+            with patch.object(stats.seed, "stream_rows", return_value=[]) as rows:
+                result = stats.update_age_stats(path)
+            query, params, _ = rows.call_args[0]
+            self.assertIn("created_at = %s AND user_id > %s", query)
+            self.assertEqual(
+                params[1:], ("2024-01-01 00:00:02", "2024-01-01 00:00:02", "a")
+            )
+            self.assertEqual(result.count, 2)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,82 @@
+#!/usr/bin/env python3
+"""Unit tests for seed.stream_batches"""
+import unittest
+
+seed = __import__('seed')
+
+
+class FakeCursor:
+    """Unbuffered-cursor stand-in serving rows and recording fetch sizes."""
+
+    def __init__(self, rows):
+        self.rows = list(rows)
+        self.fetches = []
+
+    def execute(self, query, params=()):
+        pass
+
+    def fetchmany(self, size):
+        self.fetches.append(size)
+        batch, self.rows = self.rows[:size], self.rows[size:]
+        return batch
+
+    def close(self):
+        pass
+
+
+class FakePool:
+    """A pool of one connection whose cursor serves rows."""
+
+    def __init__(self, rows):
+        self.fake_cursor = FakeCursor(rows)
+        self.closed = False
+        self.unread_result = False
+
+    def acquire(self):
+        return self
+
+    def cursor(self, buffered=True):
+        return self.fake_cursor
+
+    def close(self):
+        self.closed = True
+
+    shutdown = close
+
+
+class TestStreamBatches(unittest.TestCase):
+    """
+    Test case for batch sizing in stream_batches.
+    """
+
+    def test_plain_batches(self):
+        """Without a memory limit every batch is batch_size rows."""
+        pool = FakePool([(i,) for i in range(25)])
+        batches = list(seed.stream_batches("SELECT", batch_size=10, pool=pool))
+        self.assertEqual([len(batch) for batch in batches], [10, 10, 5])
+        self.assertTrue(pool.closed)
+
+    def test_memory_limit_holds_from_first_batch(self):
+        """The first batch already respects memory_limit."""
+        rows = [("x" * 1000,) for _ in range(100)]
+        limit = 5 * seed._row_size(rows[0])
+        pool = FakePool(rows)
+        batches = list(seed.stream_batches(
+            "SELECT", batch_size=50, memory_limit=limit, pool=pool
+        ))
+        self.assertEqual(sum(len(batch) for batch in batches), 100)
+        for batch in batches:
+            self.assertLessEqual(sum(seed._row_size(row) for row in batch), limit)
+        self.assertLessEqual(max(pool.fake_cursor.fetches), 10)
+
+    def test_probe_rows_topped_up(self):
+        """Small rows still come in full batch_size batches."""
+        pool = FakePool([(i,) for i in range(45)])
+        batches = list(seed.stream_batches(
+            "SELECT", batch_size=20, memory_limit=1 << 20, pool=pool
+        ))
+        self.assertEqual([len(batch) for batch in batches], [20, 20, 5])
+
+
+if __name__ == "__main__":
+    unittest.main()
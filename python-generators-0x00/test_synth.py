@@ -0,0 +1,46 @@
+#!/usr/bin/env python3
+"""Unit tests for synth"""
+import unittest
+import uuid
+
+synth = __import__('synth')
+
+ROWS = 23456
+
+
+class TestGenerateRows(unittest.TestCase):
+    """
+    Test case for reproducible row generation across slices.
+    """
+
+    @classmethod
+    def setUpClass(cls):
+        cls.whole = list(synth.generate_rows(0, ROWS))
+
+    def test_slices_concatenate_to_whole(self):
+        """Generating each _slices piece separately gives the same rows."""
+        for parts in (1, 2, 3, 5):
+            slices = synth._slices(ROWS, parts)
+            self.assertEqual(slices[0][0], 0)
+            self.assertEqual(slices[-1][1], ROWS)
+            pieces = []
+            for low, high in slices:
+                pieces.extend(synth.generate_rows(low, high))
+            self.assertEqual(pieces, self.whole)
+
+    def test_unaligned_ranges(self):
+        """Ranges that start or stop inside a chunk match the whole run."""
+        for low, high in ((5, 23000), (9999, 10001), (12345, ROWS), (0, 1)):
+            self.assertEqual(list(synth.generate_rows(low, high)), self.whole[low:high])
+
+    def test_binary_ids(self):
+        """binary_ids yields the same UUIDs as 16 raw bytes."""
+        binary = list(synth.generate_rows(100, 110, binary_ids=True))
+        self.assertEqual(
+            [row[0] for row in binary],
+            [uuid.UUID(row[0]).bytes for row in self.whole[100:110]],
+        )
+
+
+if __name__ == "__main__":
+    unittest.main()